@@ -1,21 +1,24 @@
 import streamlit as st
-import tempfile
-from graphs.resume_match_graph import app as resume_graph
 from streamlit_extras.stylable_container import stylable_container
-import time
-import fitz  # PyMuPDF
+from utils.analysis_runner import AnalysisRunner
 import base64
 
-# Load SVG once and inject as background
+# ✅ Page Configuration
+st.set_page_config(page_title="Resume Match AI", layout="wide")
+
+# Static assets and the graph are loaded once per process, not on every rerun
+@st.cache_resource(show_spinner=False)
 def get_svg_background_base64(svg_path="blob-scene-haikei.svg"):
     with open(svg_path, "rb") as svg_file:
         encoded = base64.b64encode(svg_file.read()).decode("utf-8")
     return f"data:image/svg+xml;base64,{encoded}"
 
-svg_data_url = get_svg_background_base64()
+@st.cache_resource(show_spinner=False)
+def get_analysis_runner():
+    from graphs.resume_match_graph import app as resume_graph
+    return AnalysisRunner(resume_graph)
 
-# ✅ Page Configuration
-st.set_page_config(page_title="Resume Match AI", layout="wide")
+svg_data_url = get_svg_background_base64()
 
 # ✅ Global Style with SVG Background
 st.markdown(f"""
@@ -132,83 +135,85 @@ with col2:
 
 run_button = st.button("🚀 Analyze Resume")
 
-# ⏳ Processing
-if run_button and resume_file and jd_file:
-    with st.spinner("Running resume analysis... ⏳"):
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_pdf:
-            temp_pdf.write(resume_file.read())
-            resume_path = temp_pdf.name
-
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as temp_txt:
-            temp_txt.write(jd_file.read())
-            jd_path = temp_txt.name
-
-        doc = fitz.open(resume_path)
-        resume_text = "\n".join([page.get_text() for page in doc])
-        jd_text = open(jd_path, "r", encoding="utf-8").read()
-
-        inputs = {"resume_text": resume_text, "jd_text": jd_text}
-        result = resume_graph.invoke(inputs)
-
-    st.markdown("---")
-
-    # ✅ Match Score and Job Roles - Left and Right Layout
-    col1, col2 = st.columns([1, 1])
-    
-    with col1:
-        st.markdown("""
+# 🧩 Result sections, rendered into placeholders so they fill in as graph nodes finish
+NODE_PROGRESS = {
+    "parse_resume": "📄 Resume parsed",
+    "parse_jd": "📋 Job description parsed",
+    "semantic_skill_matcher": "🔍 Skills matched",
+    "candidate_review": "🎯 Advisor review ready",
+}
+PENDING = "<p><em>Working on it... ⏳</em></p>"
+
+def render_score(slot, result):
+    score = result.get("semantic_match_score")
+    label = f"{int(score * 100)}%" if score is not None else "⏳"
+    slot.markdown(f"""
         <div class='section' style='display: flex; flex-direction: column; justify-content: center; height: 100%;'>
             <div class='match-title'>🔍 Match Score</div>
-            <div class='match-score-circle'>""" + str(int(result.get('semantic_match_score', 0.0) * 100)) + """%</div>
+            <div class='match-score-circle'>{label}</div>
         </div>""", unsafe_allow_html=True)
-    
-    with col2:
-        st.markdown("""
-        <div class='section'>
-            <div class='match-title'>🎯 Suggested Job Roles</div>""", unsafe_allow_html=True)
-        
-        roles = result.get("realistic_roles_with_reasons", [])
-        if isinstance(roles, list) and roles:
-            for role in roles:
-                title = role.get("title", "Unknown Role")
-                reason = role.get("reason", "No reason provided.")
-                st.markdown(f"<p><b>{title}:</b> <em>{reason}</em></p>", unsafe_allow_html=True)
-        else:
-            st.markdown("<p>No job role suggestions available.</p>", unsafe_allow_html=True)
-        
-        st.markdown("</div>", unsafe_allow_html=True)
-
-    time.sleep(0.3)
-
-    # ✅ Matching Points
-    st.markdown("""
-    <div class='section'>
-        <div class='match-title'>✅ Matching Points</div>""", unsafe_allow_html=True)
-    
-    for point in result.get("matching_points", []):
-        st.markdown(f"<p>• {point}</p>", unsafe_allow_html=True)
-    
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    # ❌ Missing Points
-    st.markdown("""
-    <div class='section'>
-        <div class='match-title'>❌ Missing Points</div>""", unsafe_allow_html=True)
-    
-    for point in result.get("missing_points", []):
-        st.markdown(f"<p>• {point}</p>", unsafe_allow_html=True)
-    
-    st.markdown("</div>", unsafe_allow_html=True)
-
-    # 📈 Career Tips
-    st.markdown("""
-    <div class='section'>
-        <div class='match-title'>📈 Career Improvement Tips</div>""", unsafe_allow_html=True)
-    
-    for tip in result.get("career_improvement_tips", []):
-        st.markdown(f"<p>💡 {tip}</p>", unsafe_allow_html=True)
-    
-    st.markdown("</div>", unsafe_allow_html=True)
+
+def render_roles(slot, result, finished):
+    roles = result.get("realistic_roles_with_reasons")
+    if isinstance(roles, list) and roles:
+        body = "".join(
+            f"<p><b>{role.get('title', 'Unknown Role')}:</b> <em>{role.get('reason', 'No reason provided.')}</em></p>"
+            for role in roles
+        )
+    elif roles is None and not finished:
+        body = PENDING
+    else:
+        body = "<p>No job role suggestions available.</p>"
+    slot.markdown(f"<div class='section'><div class='match-title'>🎯 Suggested Job Roles</div>{body}</div>",
+                  unsafe_allow_html=True)
+
+def render_list(slot, title, items, bullet, finished):
+    if items is None:
+        body = "" if finished else PENDING
+    else:
+        body = "".join(f"<p>{bullet} {item}</p>" for item in items)
+    slot.markdown(f"<div class='section'><div class='match-title'>{title}</div>{body}</div>",
+                  unsafe_allow_html=True)
+
+# ⏳ Processing
+if run_button and resume_file and jd_file:
+    # Identical uploads reuse the memoized (or still running) analysis
+    job = get_analysis_runner().submit(resume_file.getvalue(), jd_file.getvalue())
+    st.session_state["analysis_key"] = job.key
+elif not (resume_file and jd_file):
+    st.session_state.pop("analysis_key", None)
+
+job = get_analysis_runner().get(st.session_state.get("analysis_key", ""))
+if job is not None:
+    st.markdown("---")
+    running = not job.done.is_set()
+
+    # The graph runs in a background worker. While it does, only this fragment reruns,
+    # every half second, so the script thread is never blocked waiting on it; a rerun
+    # (any widget change) simply re-attaches to the same job.
+    @st.fragment(run_every=0.5 if running else None)
+    def show_analysis():
+        finished = job.done.is_set()  # read first: once set, the snapshot is final
+        _, result, completed, error = job.snapshot()
+        if not finished:
+            steps = [NODE_PROGRESS[n] for n in completed if n in NODE_PROGRESS]
+            st.caption(" · ".join(steps) + " ⏳" if steps else "Running resume analysis... ⏳")
+
+        # ✅ Match Score and Job Roles - Left and Right Layout
+        col1, col2 = st.columns([1, 1])
+        with col1:
+            render_score(st.empty(), result)
+        with col2:
+            render_roles(st.empty(), result, finished)
+        render_list(st.empty(), "✅ Matching Points", result.get("matching_points"), "•", finished)
+        render_list(st.empty(), "❌ Missing Points", result.get("missing_points"), "•", finished)
+        render_list(st.empty(), "📈 Career Improvement Tips", result.get("career_improvement_tips"), "💡", finished)
+        if error:
+            st.error(f"Analysis failed: {error}. Click Analyze to retry.")
+        if finished and running:
+            st.rerun()  # one full rerun registers the fragment again without the timer
+
+    show_analysis()
 
 else:
-    st.warning("📥 Please upload both Resume and Job Description to begin.")
\ No newline at end of file
+    st.warning("📥 Please upload both Resume and Job Description to begin.")
@@ -0,0 +1,92 @@
+"""Compare a faster embedding backend with the PyTorch reference on the sample data.
+
+Reports how closely the backend's embeddings and match scores track the `torch`
+backend and how much faster it encodes. Exits 1 if agreement is below the limits.
+
+Usage (from the repo root):
+    python -m benchmarks.embedding_parity --backend onnx-int8
+    python -m benchmarks.embedding_parity --backend torch-int8 --model all-MiniLM-L6-v2
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from benchmarks.run_benchmarks import SAMPLE_JD, SAMPLE_RESUME
+
+
+def _sample_corpus():
+    from benchmarks.fake_llm import CANNED_RESPONSES
+    from utils.pdf_utils import extract_text_from_pdf
+
+    with open(SAMPLE_JD, "r", encoding="utf-8") as f:
+        jd_text = f.read()
+    resume_text = extract_text_from_pdf(SAMPLE_RESUME)
+    lines = [l.strip() for l in (resume_text + "\n" + jd_text).splitlines() if len(l.strip()) > 3]
+    skills = CANNED_RESPONSES["resume_extraction"]["skills"] + CANNED_RESPONSES["jd_extraction"]["skills"]
+    return [resume_text, jd_text] + lines + skills
+
+
+def _encode(model, texts, repeats):
+    embs = model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    started = time.perf_counter()
+    for _ in range(repeats):
+        model.encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    return embs, (time.perf_counter() - started) / max(repeats, 1)
+
+
+def compare_backends(model_name, backend, texts, repeats=3):
+    """Agreement and speed of `backend` against `torch` for `model_name` on `texts`."""
+    from utils.model_registry import get_sentence_model
+
+    ref, ref_s = _encode(get_sentence_model(model_name, device="cpu", backend="torch"), texts, repeats)
+    cand, cand_s = _encode(get_sentence_model(model_name, device="cpu", backend=backend), texts, repeats)
+    per_text = np.einsum("ij,ij->i", ref, cand)
+    # Every pairwise score is what the matchers threshold and rank on
+    score_delta = np.abs(ref @ ref.T - cand @ cand.T) * 100
+    top1 = np.mean(np.argsort(-(ref @ ref.T), axis=1)[:, 1] == np.argsort(-(cand @ cand.T), axis=1)[:, 1])
+    return {
+        "model": model_name,
+        "backend": backend,
+        "texts": len(texts),
+        "min_cosine": round(float(per_text.min()), 5),
+        "mean_cosine": round(float(per_text.mean()), 5),
+        "max_score_delta": round(float(score_delta.max()), 3),
+        "mean_score_delta": round(float(score_delta.mean()), 3),
+        "nearest_neighbour_agreement": round(float(top1), 4),
+        "torch_ms": round(ref_s * 1000, 2),
+        "backend_ms": round(cand_s * 1000, 2),
+        "speedup": round(ref_s / cand_s, 2) if cand_s else None,
+    }
+
+
+def main():
+    from config import EMBEDDING_MODEL
+    from utils.model_registry import BACKENDS
+
+    parser = argparse.ArgumentParser(description="Check an embedding backend against the PyTorch path.")
+    parser.add_argument("--backend", choices=[b for b in BACKENDS if b != "torch"], default="onnx-int8")
+    parser.add_argument("--model", default=EMBEDDING_MODEL)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-cosine", type=float, default=0.99, help="Minimum mean embedding cosine vs torch")
+    parser.add_argument("--max-score-delta", type=float, default=2.0, help="Max match score change, in % points")
+    args = parser.parse_args()
+
+    report = compare_backends(args.model, args.backend, _sample_corpus(), args.repeats)
+    for key, value in report.items():
+        print(f"{key:<28}{value}")
+
+    failures = []
+    if report["mean_cosine"] < args.min_cosine:
+        failures.append(f"mean cosine {report['mean_cosine']} < {args.min_cosine}")
+    if report["max_score_delta"] > args.max_score_delta:
+        failures.append(f"max score delta {report['max_score_delta']} > {args.max_score_delta}")
+    if failures:
+        print("\n❌ Parity check failed: " + "; ".join(failures))
+        sys.exit(1)
+    print("\n✅ Parity check passed")
+
+
+if __name__ == "__main__":
+    main()
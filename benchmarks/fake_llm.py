@@ -0,0 +1,145 @@
+"""Offline stand-in for ChatOpenAI used by the benchmarks.
+
+Replies with canned JSON chosen from the prompt text after a configurable delay, so the
+pipeline can be timed without network access or an API key.
+"""
+import asyncio
+import json
+import time
+
+from langchain_core.messages import AIMessage
+
+CANNED_RESPONSES = {
+    "resume_extraction": {
+        "skills": ["Python", "FastAPI", "React", "Docker", "AWS", "LangChain", "PostgreSQL"],
+        "projects": ["RAG chatbot over company docs", "Realtime analytics dashboard"],
+        "experience": ["Software Engineer, Acme, 2022-2024: Python APIs, LangChain agents on AWS"],
+    },
+    "jd_extraction": {
+        "skills": ["Python", "JavaScript", "React", "SQL", "MongoDB", "AWS", "Docker", "LangChain"],
+        "responsibilities": [
+            "Design and maintain GenAI-powered applications",
+            "Build and integrate APIs and third-party services",
+            "Design and manage databases for AI-intensive applications",
+        ],
+    },
+    "skill_match": {
+        "matched_skills": ["Python", "React", "AWS", "Docker", "LangChain"],
+        "unmatched_skills": ["MongoDB"],
+        "matched_responsibilities": ["Build and integrate APIs and third-party services"],
+        "unmatched_responsibilities": [],
+        "matching_points": ["Strong Python backend work", "LLM application experience"],
+        "missing_points": ["No NoSQL experience"],
+        "suggested_roles": [{"role": "AI Engineer", "reason": "Builds LLM applications in Python on AWS"}],
+    },
+    "candidate_review": {
+        "llm_verdicts": [
+            {"question": "Does this resume show hands-on experience with LLMs?", "verdict": "✅", "reason": "RAG chatbot"},
+        ],
+        "realistic_roles_with_reasons": [{"title": "AI Engineer", "reason": "Built LLM applications"}],
+        "advisor_suggestions": ["Add a MongoDB project"],
+        "career_improvement_tips": ["Get AWS certified"],
+        "verified_skill_verdicts": ["Python: Verified"],
+    },
+}
+
+# Prompt markers -> canned response key, checked in order
+PROMPT_MARKERS = [
+    ("From the following resume text", "resume_extraction"),
+    ("From the following job description", "jd_extraction"),
+    ("intelligently compare resumes", "skill_match"),
+    ("expert resume reviewer and career advisor", "candidate_review"),
+]
+
+
+class FakeChatOpenAI:
+    """Duck-typed ChatOpenAI: `invoke`/`ainvoke` return an AIMessage with usage metadata.
+
+    `with_structured_output` mimics ChatOpenAI's `include_raw=True` result, validating
+    the canned reply against the schema.
+
+    `latency` is the simulated round trip in seconds. Keys listed in `empty` get the
+    same fields with empty lists, which is how the benchmarks force the regex fallback
+    parsers to run.
+    """
+
+    def __init__(self, latency=0.0, empty=(), responses=None):
+        self.latency = latency
+        self.empty = set(empty)
+        self.responses = responses or CANNED_RESPONSES
+        self.calls = 0
+
+    def _classify(self, text):
+        for marker, key in PROMPT_MARKERS:
+            if marker in text:
+                return key
+        return None
+
+    def _message(self, prompt):
+        self.calls += 1
+        text = prompt if isinstance(prompt, str) else str(prompt)
+        key = self._classify(text)
+        if key is None:
+            payload = {}
+        elif key in self.empty:
+            payload = {field: [] for field in self.responses[key]}
+        else:
+            payload = self.responses[key]
+        content = json.dumps(payload)
+        prompt_tokens = len(text) // 4
+        completion_tokens = len(content) // 4
+        return AIMessage(
+            content=content,
+            usage_metadata={
+                "input_tokens": prompt_tokens,
+                "output_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        )
+
+    def invoke(self, prompt, **kwargs):
+        if self.latency:
+            time.sleep(self.latency)
+        return self._message(prompt)
+
+    async def ainvoke(self, prompt, **kwargs):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return self._message(prompt)
+
+    def with_structured_output(self, schema, include_raw=False, **kwargs):
+        return _FakeStructured(self, schema, include_raw)
+
+
+class _FakeStructured:
+    def __init__(self, llm, schema, include_raw):
+        self.llm = llm
+        self.schema = schema
+        self.include_raw = include_raw
+
+    def _result(self, message):
+        try:
+            parsed, error = self.schema.model_validate_json(message.content), None
+        except ValueError as e:
+            parsed, error = None, e
+        if not self.include_raw:
+            if error is not None:
+                raise error
+            return parsed
+        return {"raw": message, "parsed": parsed, "parsing_error": error}
+
+    def invoke(self, prompt, **kwargs):
+        return self._result(self.llm.invoke(prompt, **kwargs))
+
+    async def ainvoke(self, prompt, **kwargs):
+        return self._result(await self.llm.ainvoke(prompt, **kwargs))
+
+
+def install_fake_llm(latency=0.0, empty=()):
+    """Swap the gateway's shared client for a FakeChatOpenAI and return it."""
+    import utils.llm_gateway as llm_gateway
+
+    fake = FakeChatOpenAI(latency=latency, empty=empty)
+    llm_gateway._llm = fake
+    llm_gateway._structured_llms.clear()
+    return fake
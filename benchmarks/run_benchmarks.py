@@ -0,0 +1,287 @@
+"""Reproducible benchmarks for the resume match pipeline.
+
+Every LLM call is served by benchmarks.fake_llm, so no API key or network is needed.
+Each case runs in its own subprocess so peak RSS is per case, not cumulative.
+
+Usage (from the repo root):
+    python -m benchmarks.run_benchmarks                       # run + compare to baseline
+    python -m benchmarks.run_benchmarks --save-baseline       # record a new baseline
+    python -m benchmarks.run_benchmarks --cases graph_end_to_end --llm-latency 0.5
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+# Offline defaults; must be set before any repo module reads config
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-offline")
+os.environ["LLM_CACHE_ENABLED"] = "false"  # time real work, not cache hits
+os.environ["ARTIFACT_STORE_ENABLED"] = "false"
+os.environ["LLM_REQUESTS_PER_MINUTE"] = "0"
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SAMPLE_RESUME = os.path.join(REPO_ROOT, "sample_data", "sample_resume.pdf")
+SAMPLE_JD = os.path.join(REPO_ROOT, "sample_data", "sample_jd.txt")
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+
+# Start-up: a fresh interpreter must not load any of these until they are used
+HEAVY_MODULES = ("torch", "sentence_transformers", "scipy", "fitz", "openai", "langchain_openai")
+COLD_SNIPPETS = {
+    # Everything a CLI or worker imports before it does any work
+    "cold_import": "import graphs.resume_match_graph, match_engine, screen_resumes, rank_resumes",
+    # ...plus compiling the graph, which needs langgraph/langchain_core
+    "cold_start": "from graphs.resume_match_graph import app",
+}
+
+
+def _sample_texts():
+    from utils.pdf_utils import extract_text_from_pdf
+
+    with open(SAMPLE_JD, "r", encoding="utf-8") as f:
+        jd_text = f.read()
+    return extract_text_from_pdf(SAMPLE_RESUME), jd_text
+
+
+# --- Cases: each returns (operation, items processed per call) ---
+def case_pdf_extraction(args):
+    from utils.pdf_utils import extract_text_from_pdf
+
+    with open(SAMPLE_RESUME, "rb") as f:
+        pdf_bytes = f.read()
+    return (lambda: extract_text_from_pdf(pdf_bytes)), 1
+
+
+def case_regex_parsing(args):
+    from benchmarks.fake_llm import install_fake_llm
+    from utils.data_utils import parse_resume_text, parse_jd_text
+
+    install_fake_llm(empty={"resume_extraction", "jd_extraction"})
+    resume_text, jd_text = _sample_texts()
+    return (lambda: (parse_resume_text(resume_text), parse_jd_text(jd_text))), 2
+
+
+def case_embedding(args):
+    from utils.model_registry import get_sentence_model
+
+    resume_text, jd_text = _sample_texts()
+    model = get_sentence_model()
+    return (lambda: model.encode([resume_text, jd_text])), 2
+
+
+def case_scoring(args):
+    from match_engine import compute_match_score
+
+    resume_text, jd_text = _sample_texts()
+    return (lambda: compute_match_score(resume_text, jd_text)), 1
+
+
+def case_skill_matching(args):
+    from benchmarks.fake_llm import CANNED_RESPONSES
+    from match_engine import match_skills_semantic
+
+    resume = CANNED_RESPONSES["resume_extraction"]
+    jd = CANNED_RESPONSES["jd_extraction"]
+    return (lambda: match_skills_semantic(
+        resume["skills"], jd["skills"], resume["projects"], jd["responsibilities"]
+    )), 1
+
+
+def case_ranking(args):
+    from match_engine import rank_resumes
+
+    resume_text, jd_text = _sample_texts()
+    lines = resume_text.splitlines()
+    # Distinct documents so nothing upstream can dedupe them
+    pool = [f"Candidate {i}\n" + "\n".join(lines[i % len(lines):] + lines[:i % len(lines)])
+            for i in range(args.pool_size)]
+    return (lambda: rank_resumes(jd_text, pool, top_k=50)), args.pool_size
+
+
+def case_shortlist(args):
+    from utils.text_index import TextIndex
+
+    resume_text, jd_text = _sample_texts()
+    lines = resume_text.splitlines()
+    pool = [f"Candidate {i}\n" + "\n".join(lines[i % len(lines):] + lines[:i % len(lines)])
+            for i in range(args.pool_size)]
+    index = TextIndex(":memory:")
+    index.add_many((str(i), text) for i, text in enumerate(pool))
+    return (lambda: index.search(jd_text, limit=50)), args.pool_size
+
+
+def case_graph_end_to_end(args):
+    from benchmarks.fake_llm import install_fake_llm
+    from graphs.resume_match_graph import app
+
+    install_fake_llm(latency=args.llm_latency)
+    resume_text, jd_text = _sample_texts()
+    inputs = {"resume_text": resume_text, "jd_text": jd_text}
+    return (lambda: app.invoke(inputs)), 1
+
+
+def _cold_case(name):
+    snippet = (
+        f"import sys\n{COLD_SNIPPETS[name]}\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "if heavy: sys.exit('loaded at start-up: ' + ', '.join(heavy))\n"
+    )
+
+    def case(args):
+        def operation():
+            proc = subprocess.run([sys.executable, "-c", snippet], cwd=REPO_ROOT, capture_output=True, text=True)
+            if proc.returncode:
+                raise RuntimeError(proc.stderr.strip().splitlines()[-1])
+        return operation, 1
+    return case
+
+
+CASES = {
+    "cold_import": _cold_case("cold_import"),
+    "cold_start": _cold_case("cold_start"),
+    "pdf_extraction": case_pdf_extraction,
+    "regex_parsing": case_regex_parsing,
+    "embedding": case_embedding,
+    "scoring": case_scoring,
+    "skill_matching": case_skill_matching,
+    "ranking": case_ranking,
+    "shortlist": case_shortlist,
+    "graph_end_to_end": case_graph_end_to_end,
+}
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+def run_case(name, args):
+    """Time one case in the current process and return its summary."""
+    try:
+        operation, items = CASES[name](args)
+        for _ in range(args.warmup):
+            operation()
+        timings = []
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            operation()
+            timings.append(time.perf_counter() - t0)
+        elapsed = time.perf_counter() - started
+    except Exception as e:
+        reason = (str(e).splitlines() or [""])[0]
+        return {"case": name, "status": f"skipped: {type(e).__name__}: {reason}"}
+
+    return {
+        "case": name,
+        "status": "ok",
+        "iterations": args.iterations,
+        "p50_ms": round(_percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(_percentile(timings, 95) * 1000, 3),
+        "mean_ms": round(statistics.mean(timings) * 1000, 3),
+        "throughput_per_s": round(items * args.iterations / elapsed, 2) if elapsed else None,
+        # ru_maxrss is KiB on Linux
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def run_case_isolated(name, args):
+    cmd = [
+        sys.executable, "-m", "benchmarks.run_benchmarks", "--single", name,
+        "--iterations", str(args.iterations), "--warmup", str(args.warmup),
+        "--llm-latency", str(args.llm_latency), "--pool-size", str(args.pool_size),
+    ]
+    proc = subprocess.run(cmd, cwd=REPO_ROOT, capture_output=True, text=True)
+    for line in reversed(proc.stdout.strip().splitlines()):
+        if line.startswith("{"):
+            return json.loads(line)
+    return {"case": name, "status": f"failed: {proc.stderr.strip().splitlines()[-1:] or proc.returncode}"}
+
+
+def compare(results, baseline, tolerance, startup_budget_ms=None):
+    """Return a list of human-readable regressions against `baseline` (and the start-up budget)."""
+    regressions = []
+    for result in results:
+        if result["case"] in COLD_SNIPPETS and result.get("status") != "ok":
+            regressions.append(f"{result['case']}: {result.get('status')}")
+        if (result["case"] == "cold_import" and result.get("status") == "ok"
+                and startup_budget_ms and result["p50_ms"] > startup_budget_ms):
+            regressions.append(f"cold_import.p50_ms: {result['p50_ms']} over the {startup_budget_ms} ms budget")
+        base = baseline.get(result["case"])
+        if result.get("status") != "ok" or not base or base.get("status") != "ok":
+            continue
+        for metric in ("p50_ms", "p95_ms", "peak_rss_mb"):
+            if result[metric] > base[metric] * (1 + tolerance):
+                regressions.append(
+                    f"{result['case']}.{metric}: {result[metric]} vs baseline {base[metric]} "
+                    f"(+{(result[metric] / base[metric] - 1) * 100:.0f}%)"
+                )
+    return regressions
+
+
+def print_table(results, baseline):
+    print(f"\n{'case':<20}{'p50 ms':>10}{'p95 ms':>10}{'items/s':>12}{'RSS MB':>9}{'Δp50':>8}")
+    for r in results:
+        if r.get("status") != "ok":
+            print(f"{r['case']:<20}  {r['status']}")
+            continue
+        base = baseline.get(r["case"], {})
+        delta = f"{(r['p50_ms'] / base['p50_ms'] - 1) * 100:+.0f}%" if base.get("p50_ms") else "-"
+        print(f"{r['case']:<20}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}"
+              f"{r['throughput_per_s']:>12.1f}{r['peak_rss_mb']:>9.1f}{delta:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the resume match pipeline with a fake LLM.")
+    parser.add_argument("--cases", default=",".join(CASES), help="Comma-separated case names")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--warmup", type=int, default=2)
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Fake LLM round trip, seconds")
+    parser.add_argument("--pool-size", type=int, default=200, help="Resumes per ranking call")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline with this run")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed slowdown before failing")
+    parser.add_argument("--in-process", action="store_true", help="Run all cases in this process")
+    parser.add_argument("--startup-budget-ms", type=float, default=500,
+                        help="Max p50 for cold_import (fresh interpreter importing the entry points); 0 = off")
+    parser.add_argument("--single", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(run_case(args.single, args)))
+        return
+
+    names = [n.strip() for n in args.cases.split(",") if n.strip()]
+    unknown = [n for n in names if n not in CASES]
+    if unknown:
+        parser.error(f"unknown case(s): {', '.join(unknown)}")
+
+    results = [run_case(n, args) if args.in_process else run_case_isolated(n, args) for n in names]
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump({r["case"]: r for r in results}, f, indent=2)
+        print(f"\n💾 Baseline saved to {args.baseline}")
+        return
+
+    regressions = compare(results, baseline, args.tolerance, args.startup_budget_ms)
+    if regressions:
+        print("\n❌ Regressions:")
+        for line in regressions:
+            print("•", line)
+        sys.exit(1)
+    print("\n✅ No regressions" if baseline else "\nℹ️ No baseline to compare against (run with --save-baseline)")
+
+
+if __name__ == "__main__":
+    main()
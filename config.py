@@ -0,0 +1,89 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+
+def _env_bool(name, default):
+    return os.getenv(name, str(default)).strip().lower() in ("1", "true", "yes", "on")
+
+
+# --- LLM ---
+OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+LLM_MODEL = os.getenv("LLM_MODEL", "gpt-4o")
+LLM_TEMPERATURE = float(os.getenv("LLM_TEMPERATURE", "0.3"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))  # in-flight calls per process
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "500"))  # 0 = unlimited
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "5"))
+LLM_BACKOFF_BASE_SECONDS = float(os.getenv("LLM_BACKOFF_BASE_SECONDS", "1.0"))
+LLM_BACKOFF_MAX_SECONDS = float(os.getenv("LLM_BACKOFF_MAX_SECONDS", "30"))
+LLM_TIMEOUT_SECONDS = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+LLM_HTTP_POOL_SIZE = int(os.getenv("LLM_HTTP_POOL_SIZE", "20"))
+LLM_STRUCTURED_METHOD = os.getenv("LLM_STRUCTURED_METHOD", "json_schema")  # or "function_calling" / "json_mode"
+LLM_REPAIR_ATTEMPTS = int(os.getenv("LLM_REPAIR_ATTEMPTS", "1"))  # extra calls to fix an invalid structured reply
+LLM_PRICE_INPUT_PER_MTOK = float(os.getenv("LLM_PRICE_INPUT_PER_MTOK", "2.5"))  # USD, for cost estimates
+LLM_PRICE_OUTPUT_PER_MTOK = float(os.getenv("LLM_PRICE_OUTPUT_PER_MTOK", "10.0"))
+
+# --- Prompt size ---
+PROMPT_TOKEN_BUDGET = int(os.getenv("PROMPT_TOKEN_BUDGET", "2000"))  # per document; 0 = no limit
+CHUNK_TOKENS = int(os.getenv("CHUNK_TOKENS", "128"))
+
+# --- Telemetry ---
+TRACE_LOG_PATH = os.getenv("TRACE_LOG_PATH", "")  # append per-request traces as JSON lines; "" = off
+
+# --- LLM response cache ---
+LLM_CACHE_ENABLED = _env_bool("LLM_CACHE_ENABLED", True)
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", ".cache/llm_cache.sqlite3")
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "5000"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))  # 0 = never expire
+# Near-duplicate inputs (e.g. a reposted JD) reuse a cached result; needs the LLM cache
+SEMANTIC_CACHE_ENABLED = _env_bool("SEMANTIC_CACHE_ENABLED", False)
+SEMANTIC_CACHE_DIR = os.getenv("SEMANTIC_CACHE_DIR", ".cache/semantic_cache")
+SEMANTIC_CACHE_THRESHOLD = float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.97"))  # min cosine similarity for a hit
+
+# --- Artifact store (incremental re-scoring) ---
+ARTIFACT_STORE_ENABLED = _env_bool("ARTIFACT_STORE_ENABLED", True)
+ARTIFACT_STORE_PATH = os.getenv("ARTIFACT_STORE_PATH", ".cache/artifacts.sqlite3")
+ARTIFACT_STORE_MAX_ENTRIES = int(os.getenv("ARTIFACT_STORE_MAX_ENTRIES", "10000"))
+
+# --- Embedding models ---
+EMBEDDING_MODEL = os.getenv("EMBEDDING_MODEL", "all-mpnet-base-v2")  # document-level scoring
+SKILL_EMBEDDING_MODEL = os.getenv("SKILL_EMBEDDING_MODEL", "all-MiniLM-L6-v2")  # short phrases
+EMBEDDING_DEVICE = os.getenv("EMBEDDING_DEVICE") or None  # e.g. "cpu", "cuda"; None = auto
+# "torch", "torch-int8" (dynamic int8 Linear layers), "onnx" or "onnx-int8" (ONNX Runtime)
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_FILE = os.getenv("EMBEDDING_ONNX_FILE", "")  # e.g. "onnx/model_qint8_avx512.onnx" from the model repo
+EMBEDDING_QUANTIZATION = os.getenv("EMBEDDING_QUANTIZATION", "avx2")  # onnx-int8 export target: arm64/avx2/avx512/avx512_vnni
+ONNX_EXPORT_DIR = os.getenv("ONNX_EXPORT_DIR", ".cache/onnx")
+EMBEDDING_WINDOW_OVERLAP = int(os.getenv("EMBEDDING_WINDOW_OVERLAP", "32"))  # tokens shared by adjacent document windows
+
+# --- Vector store ---
+VECTOR_STORE_DIR = os.getenv("VECTOR_STORE_DIR", ".cache/vector_store")
+VECTOR_STORE_DTYPE = os.getenv("VECTOR_STORE_DTYPE", "float32")  # or "float16" to halve disk/RAM
+PHRASE_STORE_DIR = os.getenv("PHRASE_STORE_DIR", ".cache/phrase_vectors")  # skill/responsibility embeddings; "" = off
+
+# --- Keyword shortlist (BM25 prefilter before embedding scoring) ---
+TEXT_INDEX_PATH = os.getenv("TEXT_INDEX_PATH", ".cache/text_index.sqlite3")
+SHORTLIST_SIZE = int(os.getenv("SHORTLIST_SIZE", "200"))  # resumes passed on to embedding scoring; 0 = no prefilter
+
+# --- Skill matching ---
+SKILL_TAXONOMY_PATH = os.getenv(
+    "SKILL_TAXONOMY_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "skill_taxonomy.json")
+)
+SKILL_MATCHER = os.getenv("SKILL_MATCHER", "embedding")  # "embedding" (local) or "llm"
+SKILL_MATCH_THRESHOLD = float(os.getenv("SKILL_MATCH_THRESHOLD", "0.6"))
+RESPONSIBILITY_MATCH_THRESHOLD = float(os.getenv("RESPONSIBILITY_MATCH_THRESHOLD", "0.45"))
+
+# --- HTTP service ---
+SERVICE_BATCH_SIZE = int(os.getenv("SERVICE_BATCH_SIZE", "64"))  # max pairs per batched encode
+SERVICE_BATCH_WAIT_MS = float(os.getenv("SERVICE_BATCH_WAIT_MS", "10"))  # how long to wait for a batch to fill
+
+# --- Batch screening ---
+JOB_QUEUE_PATH = os.getenv("JOB_QUEUE_PATH", ".cache/jobs.sqlite3")
+JOB_CHECKPOINT_PATH = os.getenv("JOB_CHECKPOINT_PATH", ".cache/checkpoints.sqlite3")
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))
+JOB_LEASE_SECONDS = int(os.getenv("JOB_LEASE_SECONDS", "600"))  # a job is re-queued if its worker goes silent this long
+
+# --- Streamlit UI ---
+ANALYSIS_WORKERS = int(os.getenv("ANALYSIS_WORKERS", "2"))  # background graph runs per app process
+ANALYSIS_RESULT_CACHE_SIZE = int(os.getenv("ANALYSIS_RESULT_CACHE_SIZE", "32"))  # memoized analyses, by upload hash
@@ -1,161 +1,233 @@
-from langchain_core.runnables import RunnableLambda
-from langchain_core.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
-from langgraph.graph import StateGraph, END
-from sentence_transformers import SentenceTransformer
+import operator
+from typing import Annotated, TypedDict
 from utils.data_utils import (
     parse_resume_text,
     parse_jd_text,
-    get_llm_matching
 )
-from utils.embedding_utils import get_mean_embedding, cosine_similarity
-from utils.llm_utils import call_llm_json
-from prompts import extract_resume_info_with_llm, extract_jd_info_with_llm, llm_match_skills_and_responsibilities
-embedder = SentenceTransformer("all-mpnet-base-v2")
-llm = ChatOpenAI(model="gpt-4o", temperature=0.3)
+from utils.telemetry import instrument_node
+from utils.artifact_store import content_hash, load_or_compute
+from utils.chunking import fits_budget
+from utils.skill_taxonomy import get_taxonomy
+from prompts import (
+    CANDIDATE_REVIEW_TEMPLATE,
+    JD_EXTRACTION_TEMPLATE,
+    RESUME_EXTRACTION_TEMPLATE,
+    SKILL_MATCH_TEMPLATE,
+    fingerprint,
+    llm_match_skills_and_responsibilities,
+    review_candidate_with_llm,
+)
+from match_engine import match_skills_semantic
+from config import (
+    SKILL_MATCHER, SKILL_MATCH_THRESHOLD, RESPONSIBILITY_MATCH_THRESHOLD, EMBEDDING_BACKEND,
+    SKILL_EMBEDDING_MODEL, PROMPT_TOKEN_BUDGET, CHUNK_TOKENS,
+)
 
 INITIAL_KEYS = [
     "resume_text", "jd_text"
 ]
 
+# Each key is its own channel, so nodes running in the same step can write
+# disjoint keys without clobbering each other. Nodes return only the keys they
+# set, and the input texts are stored once (parsed data never copies them).
+ResumeData = TypedDict("ResumeData", {"SKILLS": str, "Key projects": list, "Experience": list})
+
+class JDData(TypedDict):
+    critical_skills: list
+    key_responsibilities: list
+
+class ResumeMatchInput(TypedDict):
+    resume_text: str
+    jd_text: str
+
+class ResumeMatchOutput(TypedDict, total=False):
+    resume_data: ResumeData
+    jd_data: JDData
+    matched_skills: list
+    unmatched_skills: list
+    matched_responsibilities: list
+    unmatched_responsibilities: list
+    matching_points: list
+    missing_points: list
+    semantic_match_score: float
+    llm_verdicts: list
+    realistic_roles_with_reasons: list
+    advisor_suggestions: list
+    career_improvement_tips: list
+    verified_skill_verdicts: list
+
+class ResumeMatchState(ResumeMatchInput, ResumeMatchOutput, total=False):
+    # Content hash of every input and derived artifact; parallel nodes each add
+    # their own entries, which the `or` reducer merges
+    hashes: Annotated[dict, operator.or_]
+
+# --- Parse Nodes ---
+# Every node below reuses its previous output from the artifact store when the
+# hashes of its inputs are unchanged, so editing only the JD (or only the resume)
+# recomputes just the affected downstream artifacts. The keys also cover the
+# prompt, schema and settings that shape each output, so changing those does too.
+def _parse_settings(template, schema_name):
+    # Prompt compression and skill canonicalization shape parsed data as much as the prompt does
+    return [fingerprint(template, schema_name), PROMPT_TOKEN_BUDGET, CHUNK_TOKENS,
+            SKILL_EMBEDDING_MODEL, get_taxonomy().fingerprint]
+
+def parse_resume_node(state):
+    resume_hash = content_hash(state["resume_text"])
+    # The JD only influences resume parsing when the resume is over the prompt budget
+    inputs = [resume_hash, *_parse_settings(RESUME_EXTRACTION_TEMPLATE, "ResumeExtraction")]
+    if state.get("jd_text") and not fits_budget(state["resume_text"]):
+        inputs.append(content_hash(state["jd_text"]))
+    resume_data = load_or_compute(
+        "resume_data", inputs,
+        lambda: parse_resume_text(state["resume_text"], state.get("jd_text")),
+    )
+    return {
+        "resume_data": resume_data,
+        "hashes": {"resume_text": resume_hash, "resume_data": content_hash(resume_data)},
+    }
+
+def parse_jd_node(state):
+    jd_hash = content_hash(state["jd_text"])
+    jd_data = load_or_compute(
+        "jd_data", [jd_hash, *_parse_settings(JD_EXTRACTION_TEMPLATE, "JDExtraction")],
+        lambda: parse_jd_text(state["jd_text"]),
+    )
+    return {
+        "jd_data": jd_data,
+        "hashes": {"jd_text": jd_hash, "jd_data": content_hash(jd_data)},
+    }
+
 # --- Node 1: Semantic Skill Matcher ---
 def semantic_skill_matcher_node(state):
-    resume_skills = state["resume_data"].get("skills", [])
+    hashes = state.get("hashes", {})
+    if SKILL_MATCHER == "llm":
+        settings = [fingerprint(SKILL_MATCH_TEMPLATE, "SkillMatch")]
+    else:
+        settings = [SKILL_MATCH_THRESHOLD, RESPONSIBILITY_MATCH_THRESHOLD, SKILL_EMBEDDING_MODEL,
+                    EMBEDDING_BACKEND, get_taxonomy().fingerprint]
+    update = load_or_compute(
+        "match_result",
+        [hashes.get("resume_data"), hashes.get("jd_data"), SKILL_MATCHER, *settings],
+        lambda: _match(state),
+    )
+    return {**update, "hashes": {"match_result": content_hash(update)}}
+
+def _match(state):
+    resume_skills = [s.strip() for s in state["resume_data"].get("SKILLS", "").split(",") if s.strip()]
     resume_projects = state["resume_data"].get("Key projects", [])
-    jd_skills = state["jd_data"].get("skills", [])
+    jd_skills = state["jd_data"].get("critical_skills", [])
     jd_responsibilities = state["jd_data"].get("key_responsibilities", [])
 
-    match_result = llm_match_skills_and_responsibilities(
+    # Local embedding matcher by default; SKILL_MATCHER=llm restores the gpt-4o comparison
+    matcher = llm_match_skills_and_responsibilities if SKILL_MATCHER == "llm" else match_skills_semantic
+    match_result = matcher(
         resume_skills, jd_skills, resume_projects, jd_responsibilities
     )
     # Extract relevant outputs
-    state["matched_skills"] = match_result.get("matched_skills", [])
-    state["unmatched_skills"] = match_result.get("unmatched_skills", [])
-    state["matched_responsibilities"] = match_result.get("matched_responsibilities", [])
-    state["unmatched_responsibilities"] = match_result.get("unmatched_responsibilities", [])
-    state["matching_points"] = match_result.get("matching_points", [])
-    state["missing_points"] = match_result.get("missing_points", [])
+    update = {
+        "matched_skills": match_result.get("matched_skills", []),
+        "unmatched_skills": match_result.get("unmatched_skills", []),
+        "matched_responsibilities": match_result.get("matched_responsibilities", []),
+        "unmatched_responsibilities": match_result.get("unmatched_responsibilities", []),
+        "matching_points": match_result.get("matching_points", []),
+        "missing_points": match_result.get("missing_points", []),
+    }
 
     # Optional: Simple semantic score (can improve later)
-    total = len(state["matching_points"]) + len(state["missing_points"])
-    state["semantic_match_score"] = round(len(state["matching_points"]) / total, 2) if total else 0.0
+    total = len(update["matching_points"]) + len(update["missing_points"])
+    update["semantic_match_score"] = round(len(update["matching_points"]) / total, 2) if total else 0.0
 
-    return state
+    # A failed LLM comparison ({}) is not reused; the local matcher has no failure mode
+    return update, bool(match_result)
 
-# --- Node 2: LLM Experience Verifier ---
-llm_verifier_prompt = PromptTemplate.from_template("""
-You are an expert resume reviewer. Answer the following questions about the candidate's experience.
-
-Resume:
-{resume}
-
-Questions:
-{questions}
-
-Respond as a JSON list: [{{"question": "...", "verdict": "✅ or ❌", "reason": "..."}}]
-""")
-
-def llm_experience_verifier_node(state):
-    resume = state["resume_text"]
-    projects = state["resume_data"].get("Key projects", [])
-    questions = [
+# --- Node 2: Candidate Review (verifier + advisor in one call) ---
+def verifier_questions(resume_data):
+    projects = resume_data.get("Key projects", [])
+    return [
         "Does this resume show hands-on experience with LLMs?",
         f"Does the project '{projects[0] if projects else ''}' qualify as LLM work?"
     ]
-    result = llm.invoke(llm_verifier_prompt.format(resume=resume, questions="\n".join(questions)))
-    import json, re
-    json_text = re.search(r'\[.*\]', result.content, re.DOTALL)
-    if json_text:
-        state["llm_verdicts"] = json.loads(json_text.group())
-    else:
-        state["llm_verdicts"] = []
-    return state
-
-# --- Node 3: Intelligent Advisor ---
-advisor_prompt = PromptTemplate.from_template("""
-You are an intelligent career advisor. Based on the resume and job description, suggest realistic job roles, reasons why they are a good fit, improvement tips, and skill verification.
-
-Resume:
-{resume}
-
-Job Description:
-{jd}
-
-Respond in this JSON format:
-{{
-  "realistic_roles_with_reasons": [
-    {{
-      "title": "Full Stack Developer",
-      "reason": "Candidate has strong backend and moderate frontend skills."
-    }},
-    {{
-      "title": "DevOps Engineer",
-      "reason": "Experience with Docker, Kubernetes, CI/CD pipelines, and cloud deployment."
-    }}
-  ],
-  "advisor_suggestions": [
-    "Contribute to open-source projects involving Flask or FastAPI.",
-    "Enhance frontend skills using React or Vue."
-  ],
-  "career_improvement_tips": [
-    "Get certified in AWS.",
-    "Work on projects involving full-stack systems."
-  ],
-  "verified_skill_verdicts": [
-    "Python: Verified",
-    "React: Not Verified"
-  ]
-}}
-""")
-
-
-def intelligent_advisor_node(state):
-    resume = state["resume_text"]
-    jd = state["jd_text"]
-    result = llm.invoke(advisor_prompt.format(resume=resume, jd=jd))
-    import json, re
-    json_text = re.search(r'\{.*\}', result.content, re.DOTALL)
-    if json_text:
-        advisor_data = json.loads(json_text.group())
-        state["realistic_roles_with_reasons"] = advisor_data.get("realistic_roles_with_reasons", [])
-        state["advisor_suggestions"] = advisor_data.get("advisor_suggestions", [])
-        state["career_improvement_tips"] = advisor_data.get("career_improvement_tips", [])
-        state["verified_skill_verdicts"] = advisor_data.get("verified_skill_verdicts", [])
-    else:
-        state["realistic_roles_with_reasons"] = []
-        state["advisor_suggestions"] = []
-        state["career_improvement_tips"] = []
-        state["verified_skill_verdicts"] = []
-    return state
+
+def candidate_review_node(state):
+    hashes = state.get("hashes", {})
+    # Only the skill lists feed the prompt, so unrelated match changes don't invalidate it
+    match_hash = content_hash([state.get("matched_skills", []), state.get("unmatched_skills", [])])
+    update = load_or_compute(
+        "candidate_review",
+        [hashes.get("resume_data"), hashes.get("jd_data"), match_hash,
+         fingerprint(CANDIDATE_REVIEW_TEMPLATE, "CandidateReview")],
+        lambda: _review(state),
+    )
+    return {**update, "hashes": {"candidate_review": content_hash(update)}}
+
+def _review(state):
+    # Works from the parsed profiles and match result, never the raw resume/JD text
+    review = review_candidate_with_llm(
+        state["resume_data"],
+        state["jd_data"],
+        {
+            "matched_skills": state.get("matched_skills", []),
+            "unmatched_skills": state.get("unmatched_skills", []),
+        },
+        verifier_questions(state["resume_data"]),
+    )
+    return {
+        "llm_verdicts": review.get("llm_verdicts", []),
+        "realistic_roles_with_reasons": review.get("realistic_roles_with_reasons", []),
+        "advisor_suggestions": review.get("advisor_suggestions", []),
+        "career_improvement_tips": review.get("career_improvement_tips", []),
+        "verified_skill_verdicts": review.get("verified_skill_verdicts", []),
+    }, bool(review)
 
 # --- Final Output Node ---
+OUTPUT_DEFAULTS = {
+    "semantic_match_score": 0.0,
+    "matching_points": [],
+    "missing_points": [],
+    "realistic_roles_with_reasons": [],
+    "advisor_suggestions": [],
+    "career_improvement_tips": [],
+    "verified_skill_verdicts": [],
+}
+
 def final_output_node(state):
-    return {
-        "semantic_match_score": state.get("semantic_match_score", 0.0),
-        "matching_points": state.get("matching_points", []),
-        "missing_points": state.get("missing_points", []),
-        "realistic_roles_with_reasons": state.get("realistic_roles_with_reasons", []),
-        "advisor_suggestions": state.get("advisor_suggestions", []),
-        "career_improvement_tips": state.get("career_improvement_tips", []),
-        "verified_skill_verdicts": state.get("verified_skill_verdicts", [])
-    }
+    # Only fills in whatever an upstream node left unset
+    return {key: default for key, default in OUTPUT_DEFAULTS.items() if key not in state}
 
 # --- Build Graph ---
-workflow = StateGraph(dict)
-workflow.add_node("parse_resume", RunnableLambda(lambda state: {**state, "resume_data": parse_resume_text(state["resume_text"]) }))
-workflow.add_node("parse_jd", RunnableLambda(lambda state: {**state, "jd_data": parse_jd_text(state["jd_text"]) }))
-workflow.add_node("semantic_skill_matcher", RunnableLambda(semantic_skill_matcher_node))
-workflow.add_node("llm_experience_verifier", RunnableLambda(llm_experience_verifier_node))
-workflow.add_node("intelligent_advisor", RunnableLambda(intelligent_advisor_node))
-workflow.add_node("final_output", RunnableLambda(final_output_node))
-
-workflow.set_entry_point("parse_resume")
-workflow.add_edge("parse_resume", "parse_jd")
-workflow.add_edge("parse_jd", "semantic_skill_matcher")
-workflow.add_edge("semantic_skill_matcher", "llm_experience_verifier")
-workflow.add_edge("llm_experience_verifier", "intelligent_advisor")
-workflow.add_edge("intelligent_advisor", "final_output")
-workflow.add_edge("final_output", END)
-
-app = workflow.compile()
-__all__ = ["app", "INITIAL_KEYS"]
+# One extraction call per document (run in parallel), a local skill match, then a
+# single joint review call over the compact parsed data: two LLM round trips on
+# the critical path and three calls in total.
+def build_graph(checkpointer=None):
+    """Compile the pipeline; pass a LangGraph checkpointer to make runs resumable."""
+    from langchain_core.runnables import RunnableLambda
+    from langgraph.graph import StateGraph, START, END
+
+    workflow = StateGraph(ResumeMatchState, input_schema=ResumeMatchInput, output_schema=ResumeMatchOutput)
+    workflow.add_node("parse_resume", RunnableLambda(instrument_node("parse_resume", parse_resume_node)))
+    workflow.add_node("parse_jd", RunnableLambda(instrument_node("parse_jd", parse_jd_node)))
+    workflow.add_node("semantic_skill_matcher", RunnableLambda(instrument_node("semantic_skill_matcher", semantic_skill_matcher_node)))
+    workflow.add_node("candidate_review", RunnableLambda(instrument_node("candidate_review", candidate_review_node)))
+    workflow.add_node("final_output", RunnableLambda(instrument_node("final_output", final_output_node)))
+
+    workflow.add_edge(START, "parse_resume")
+    workflow.add_edge(START, "parse_jd")
+    workflow.add_edge(["parse_resume", "parse_jd"], "semantic_skill_matcher")
+    workflow.add_edge("semantic_skill_matcher", "candidate_review")
+    workflow.add_edge("candidate_review", "final_output")
+    workflow.add_edge("final_output", END)
+    return workflow.compile(checkpointer=checkpointer)
+
+_app = None
+
+def __getattr__(name):
+    # `app` is compiled on first access, so importing this module (e.g. for the state
+    # types or node functions) doesn't pull in langgraph
+    global _app
+    if name == "app":
+        if _app is None:
+            _app = build_graph()
+        return _app
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+__all__ = ["app", "build_graph", "INITIAL_KEYS", "ResumeMatchState", "ResumeMatchInput", "ResumeMatchOutput"]
@@ -1,19 +1,79 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
+import numpy as np
+from config import SKILL_EMBEDDING_MODEL, SKILL_MATCH_THRESHOLD, RESPONSIBILITY_MATCH_THRESHOLD, SHORTLIST_SIZE
+from utils.embedding_utils import embed_documents
+from utils.model_registry import get_sentence_model
+from utils.vector_store import embed_with_store, get_phrase_store
+from utils.skill_taxonomy import get_taxonomy
 
+# Documents (resumes, JDs) go through `embed_documents`, which covers the whole text
+# in token windows instead of truncating at the model's max sequence length.
 def get_embeddings(text1, text2):
-    model = SentenceTransformer('all-mpnet-base-v2')  
-    embeddings = model.encode([text1, text2])
-    return embeddings
+    return embed_documents([text1, text2])
 
 def compute_match_score(resume_text, jd_text):
     resume_emb, jd_emb = get_embeddings(resume_text, jd_text)
-    score = cosine_similarity([resume_emb], [jd_emb])[0][0]
+    score = float(resume_emb @ jd_emb)
     return round(score * 100, 2)  # As percentage
 
+def score_pairs(pairs, batch_size=64):
+    """Match scores (%) for many (resume_text, jd_text) pairs; shared texts are encoded once."""
+    if not pairs:
+        return []
+    texts = list(dict.fromkeys(t for pair in pairs for t in pair))
+    position = {t: i for i, t in enumerate(texts)}
+    embs = embed_documents(texts, batch_size=batch_size)
+    resume_idx = [position[r] for r, _ in pairs]
+    jd_idx = [position[j] for _, j in pairs]
+    scores = np.einsum("ij,ij->i", embs[resume_idx], embs[jd_idx])
+    return [round(float(s) * 100, 2) for s in scores]
+
+def rank_resumes(jd_text, resume_texts, top_k=None, batch_size=64, ids=None):
+    """Score every resume against one JD and return the best `top_k`, highest first."""
+    ids = list(ids) if ids is not None else list(range(len(resume_texts)))
+    if not resume_texts:
+        return []
+
+    embs = embed_documents([jd_text] + list(resume_texts), batch_size=batch_size)
+    scores = embs[1:] @ embs[0]
+
+    k = len(scores) if not top_k else min(top_k, len(scores))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [{"id": ids[i], "score": round(float(scores[i]) * 100, 2)} for i in top]
+
+def cascade_rank(jd_text, resume_texts, index, ids, shortlist=SHORTLIST_SIZE, top_k=None, batch_size=64):
+    """`rank_resumes` over only the `shortlist` best BM25 matches from `index`."""
+    from utils.data_utils import add_to_text_index
+
+    ids = list(ids)
+    if not shortlist:
+        return rank_resumes(jd_text, resume_texts, top_k=top_k, batch_size=batch_size, ids=ids)
+    texts_by_id = dict(zip(ids, resume_texts))
+    add_to_text_index(index, ids, resume_texts)
+    candidates = [doc_id for doc_id, _ in index.search(jd_text, limit=shortlist, within=texts_by_id)]
+    if not candidates:
+        # No resume shares a term with the JD; embeddings can still rank by meaning
+        return rank_resumes(jd_text, resume_texts, top_k=top_k, batch_size=batch_size, ids=ids)
+    return rank_resumes(jd_text, [texts_by_id[i] for i in candidates], top_k=top_k,
+                        batch_size=batch_size, ids=candidates)
+
+def index_resumes(resume_texts, store, labels=None, batch_size=64):
+    """Embed resumes not yet in `store` and refresh its ANN index when it falls behind."""
+    embed_with_store(store, resume_texts, get_sentence_model(store.model_name, backend=store.backend), kind="resume",
+                     labels=labels, batch_size=batch_size)
+    if store.index_is_stale():
+        store.build_index()
+
+def search_resumes(jd_text, store, top_k=50, nprobe=8):
+    """Best `top_k` pre-indexed resumes for a JD, highest first, without re-embedding the pool."""
+    jd_emb = embed_with_store(store, [jd_text], get_sentence_model(store.model_name, backend=store.backend), kind="jd")[0]
+    hits = store.search(jd_emb, top_k=top_k, kind="resume", nprobe=nprobe)
+    return [{"id": hit["label"], "score": round(hit["score"] * 100, 2)} for hit in hits]
+
 def compare_skills(resume_skills, jd_skills):
-    resume_set = set([s.lower() for s in resume_skills])
-    jd_set = set([s.lower() for s in jd_skills])
+    taxonomy = get_taxonomy()
+    resume_set = set([s.lower() for s in taxonomy.canonicalize_all(resume_skills)])
+    jd_set = set([s.lower() for s in taxonomy.canonicalize_all(jd_skills)])
     
     common = sorted(list(resume_set & jd_set))
     missing = sorted(list(jd_set - resume_set))
@@ -22,3 +82,63 @@ def compare_skills(resume_skills, jd_skills):
         "common_skills": common,
         "missing_skills": missing
     }
+
+def _embed_phrases(skills, phrases):
+    # Skill and phrase vectors are reused from the phrase store; only unseen ones are encoded
+    texts = skills + phrases
+    if not texts:
+        return np.zeros((0, 1), dtype=np.float32)
+    store = get_phrase_store()
+    if store is None:
+        return get_sentence_model(SKILL_EMBEDDING_MODEL).encode(texts, normalize_embeddings=True, convert_to_numpy=True)
+    model = get_sentence_model(store.model_name, backend=store.backend)
+    return np.vstack([
+        embed_with_store(store, skills, model, kind="skill"),
+        embed_with_store(store, phrases, model, kind="phrase"),
+    ])
+
+def match_skills_semantic(resume_skills, jd_skills, resume_projects, jd_responsibilities,
+                          skill_threshold=SKILL_MATCH_THRESHOLD,
+                          responsibility_threshold=RESPONSIBILITY_MATCH_THRESHOLD):
+    """Local, deterministic replacement for `llm_match_skills_and_responsibilities`."""
+    from scipy.optimize import linear_sum_assignment
+
+    # Aliases collapse to one canonical name, so "JS" and "JavaScript" score as identical
+    taxonomy = get_taxonomy()
+    resume_skills, jd_skills = taxonomy.canonicalize_all(resume_skills), taxonomy.canonicalize_all(jd_skills)
+    resume_projects, jd_responsibilities = list(resume_projects), list(jd_responsibilities)
+    embs = _embed_phrases(resume_skills + jd_skills, resume_projects + jd_responsibilities)
+    bounds = np.cumsum([0, len(resume_skills), len(jd_skills), len(resume_projects), len(jd_responsibilities)])
+    r_skill, j_skill, r_proj, j_resp = (embs[bounds[i]:bounds[i + 1]] for i in range(4))
+
+    matched_skills, matching_points = [], []
+    skill_pairs = {}
+    if len(j_skill) and len(r_skill):
+        sim = j_skill @ r_skill.T
+        rows, cols = linear_sum_assignment(-sim)
+        skill_pairs = {r: c for r, c in zip(rows, cols) if sim[r, c] >= skill_threshold}
+    for i, skill in enumerate(jd_skills):
+        if i in skill_pairs:
+            matched_skills.append(skill)
+            resume_skill = resume_skills[skill_pairs[i]]
+            matching_points.append(
+                skill if resume_skill.lower() == skill.lower() else f"{skill} (resume: {resume_skill})"
+            )
+    unmatched_skills = [s for i, s in enumerate(jd_skills) if i not in skill_pairs]
+
+    evidence = np.vstack([r_skill, r_proj]) if len(r_skill) + len(r_proj) else None
+    matched_responsibilities, unmatched_responsibilities = [], []
+    if len(j_resp):
+        best = (j_resp @ evidence.T).max(axis=1) if evidence is not None else np.zeros(len(j_resp))
+        for resp, score in zip(jd_responsibilities, best):
+            (matched_responsibilities if score >= responsibility_threshold
+             else unmatched_responsibilities).append(resp)
+
+    return {
+        "matched_skills": matched_skills,
+        "unmatched_skills": unmatched_skills,
+        "matched_responsibilities": matched_responsibilities,
+        "unmatched_responsibilities": unmatched_responsibilities,
+        "matching_points": matching_points + matched_responsibilities,
+        "missing_points": [f"Missing skill: {s}" for s in unmatched_skills] + unmatched_responsibilities,
+    }
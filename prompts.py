@@ -1,34 +1,49 @@
-import os
-from dotenv import load_dotenv
-from utils.llm_utils import call_llm_json
-from langchain_core.prompts import PromptTemplate
+from functools import lru_cache
 
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+from utils.llm_utils import call_llm_json, prompt_fingerprint
 
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY is missing. Check your .env file.")
+def _template(text):
+    # langchain_core is slow to import; load it with the first prompt, not with this module
+    from langchain_core.prompts import PromptTemplate
+    return PromptTemplate.from_template(text)
 
-def extract_resume_info_with_llm(text):
-    prompt = PromptTemplate.from_template("""
+def _schemas():
+    # Same for pydantic: the output models are built with the first prompt
+    import schemas
+    return schemas
+
+@lru_cache(maxsize=None)
+def fingerprint(template, schema_name):
+    """`prompt_fingerprint` of a template here and its schema in schemas.py, for keys of artifacts
+    derived from the prompt's output: editing either one invalidates them."""
+    return prompt_fingerprint(template, getattr(_schemas(), schema_name))
+
+def _bullets(items):
+    return "\n".join(f"- {item}" for item in items) if items else "- (none)"
+
+RESUME_EXTRACTION_TEMPLATE = """
     From the following resume text, extract:
     - All relevant skills
     - All key project titles or descriptions
+    - Work experience as short lines: role, organization, duration and the main tools or achievements
 
     Return as JSON:
     {{
       "skills": [...],
-      "projects": [...]
+      "projects": [...],
+      "experience": [...]
     }}
 
     Resume:
     {text}
-    """)
-    result = call_llm_json(prompt, {"text": text})
-    return result.get("skills", []), result.get("projects", [])
+    """
 
-def extract_jd_info_with_llm(text):
-    prompt = PromptTemplate.from_template("""
+def extract_resume_info_with_llm(text):
+    prompt = _template(RESUME_EXTRACTION_TEMPLATE)
+    result = call_llm_json(prompt, {"text": text}, schema=_schemas().ResumeExtraction)
+    return result.get("skills", []), result.get("projects", []), result.get("experience", [])
+
+JD_EXTRACTION_TEMPLATE = """
     From the following job description, extract:
     - All relevant skills
     - All key responsibilities or requirements
@@ -41,12 +56,14 @@ def extract_jd_info_with_llm(text):
 
     JD:
     {text}
-    """)
-    result = call_llm_json(prompt, {"text": text})
+    """
+
+def extract_jd_info_with_llm(text):
+    prompt = _template(JD_EXTRACTION_TEMPLATE)
+    result = call_llm_json(prompt, {"text": text}, schema=_schemas().JDExtraction)
     return result.get("skills", []), result.get("responsibilities", [])
 
-def llm_match_skills_and_responsibilities(resume_skills, jd_skills, resume_projects, jd_responsibilities):
-    prompt = PromptTemplate.from_template("""
+SKILL_MATCH_TEMPLATE = """
 You are an AI assistant trained to intelligently compare resumes and job descriptions.
 
 Analyze the following:
@@ -80,7 +97,10 @@ Return as structured JSON:
     ...
   ]
 }}
-""")
+"""
+
+def llm_match_skills_and_responsibilities(resume_skills, jd_skills, resume_projects, jd_responsibilities):
+    prompt = _template(SKILL_MATCH_TEMPLATE)
 
     variables = {
         "resume_skills": resume_skills,
@@ -89,6 +109,52 @@ Return as structured JSON:
         "jd_responsibilities": jd_responsibilities,
     }
 
-    return call_llm_json(prompt, variables)
+    return call_llm_json(prompt, variables, schema=_schemas().SkillMatch)
 
+CANDIDATE_REVIEW_TEMPLATE = """
+You are an expert resume reviewer and career advisor. Work only from the structured candidate and job profiles below.
+
+Candidate skills: {resume_skills}
+Candidate projects:
+{resume_projects}
+Candidate experience:
+{resume_experience}
+
+Job skills: {jd_skills}
+Job responsibilities:
+{jd_responsibilities}
+
+Skills already matched: {matched_skills}
+Skills missing: {unmatched_skills}
+
+1. Answer each verification question with a verdict and a short reason:
+{questions}
+
+2. Suggest realistic job roles with reasons, improvement suggestions, career tips, and a verdict on whether each key skill is backed by the projects or experience.
+
+Respond in this JSON format:
+{{
+  "llm_verdicts": [{{"question": "...", "verdict": "✅ or ❌", "reason": "..."}}],
+  "realistic_roles_with_reasons": [{{"title": "Full Stack Developer", "reason": "Candidate has strong backend and moderate frontend skills."}}],
+  "advisor_suggestions": ["Contribute to open-source projects involving Flask or FastAPI."],
+  "career_improvement_tips": ["Get certified in AWS."],
+  "verified_skill_verdicts": ["Python: Verified", "React: Not Verified"]
+}}
+"""
+
+def review_candidate_with_llm(resume_data, jd_data, match_result, questions):
+    """Verifier verdicts and career advice in one call, from parsed data rather than raw text."""
+    prompt = _template(CANDIDATE_REVIEW_TEMPLATE)
+
+    variables = {
+        "resume_skills": resume_data.get("SKILLS", ""),
+        "resume_projects": _bullets(resume_data.get("Key projects", [])),
+        "resume_experience": _bullets(resume_data.get("Experience", [])),
+        "jd_skills": ", ".join(jd_data.get("critical_skills", [])),
+        "jd_responsibilities": _bullets(jd_data.get("key_responsibilities", [])),
+        "matched_skills": ", ".join(match_result.get("matched_skills", [])) or "(none)",
+        "unmatched_skills": ", ".join(match_result.get("unmatched_skills", [])) or "(none)",
+        "questions": _bullets(questions),
+    }
 
+    return call_llm_json(prompt, variables, schema=_schemas().CandidateReview)
@@ -0,0 +1,85 @@
+"""Rank a directory of resume PDFs against one job description.
+
+Usage:
+    python rank_resumes.py sample_data/sample_jd.txt path/to/resumes --top-k 50
+
+With --index-dir, resume embeddings are persisted and reused across runs, and the
+query goes through the store's ANN index instead of re-embedding the pool:
+    python rank_resumes.py jd.txt path/to/resumes --index-dir .cache/vector_store
+    python rank_resumes.py other_jd.txt --index-dir .cache/vector_store
+
+Without --index-dir, a BM25 keyword index (kept in TEXT_INDEX_PATH and updated
+incrementally) first narrows the pool to the --shortlist best keyword matches, and
+only those are embedded. --shortlist 0 embeds every resume.
+"""
+import argparse
+import json
+import os
+
+from config import SHORTLIST_SIZE, TEXT_INDEX_PATH
+from match_engine import cascade_rank, rank_resumes, index_resumes, search_resumes
+from utils.pdf_utils import extract_texts_from_pdfs
+
+
+def load_resumes(resume_dir, max_workers=None):
+    paths = sorted(
+        os.path.join(resume_dir, name)
+        for name in os.listdir(resume_dir)
+        if name.lower().endswith(".pdf")
+    )
+    texts, ids = [], []
+    for path, text in extract_texts_from_pdfs(paths, max_workers=max_workers):
+        if text is not None:
+            texts.append(text)
+            ids.append(path)
+    return ids, texts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rank resumes (PDF) against a job description (TXT).")
+    parser.add_argument("jd_path", help="Path to the job description text file")
+    parser.add_argument("resume_dir", nargs="?", help="Directory containing resume PDFs")
+    parser.add_argument("--top-k", type=int, default=20, help="Number of results to return (0 = all)")
+    parser.add_argument("--batch-size", type=int, default=64, help="Encoder batch size")
+    parser.add_argument("--workers", type=int, default=None, help="PDF extraction processes (default: all cores)")
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    parser.add_argument("--index-dir", help="Persistent vector store to add resumes to and search")
+    parser.add_argument("--nprobe", type=int, default=8, help="IVF lists scanned per query")
+    parser.add_argument("--shortlist", type=int, default=SHORTLIST_SIZE,
+                        help="Resumes kept by the keyword prefilter for embedding scoring (0 = all)")
+    parser.add_argument("--text-index", default=TEXT_INDEX_PATH, help="Keyword (BM25) index database")
+    args = parser.parse_args()
+    if not args.resume_dir and not args.index_dir:
+        parser.error("resume_dir is required unless --index-dir is given")
+
+    with open(args.jd_path, "r", encoding="utf-8") as f:
+        jd_text = f.read()
+
+    ids, texts = load_resumes(args.resume_dir, args.workers) if args.resume_dir else ([], [])
+    if args.index_dir:
+        from utils.vector_store import open_store
+        store = open_store(args.index_dir)
+        if texts:
+            index_resumes(texts, store, labels=ids, batch_size=args.batch_size)
+        results = search_resumes(jd_text, store, top_k=args.top_k or store.count("resume"), nprobe=args.nprobe)
+        pool_size = store.count("resume")
+    elif args.shortlist:
+        from utils.text_index import open_text_index
+        results = cascade_rank(jd_text, texts, open_text_index(args.text_index), ids,
+                               shortlist=args.shortlist, top_k=args.top_k, batch_size=args.batch_size)
+        pool_size = len(texts)
+    else:
+        results = rank_resumes(jd_text, texts, top_k=args.top_k, batch_size=args.batch_size, ids=ids)
+        pool_size = len(texts)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"\n🏆 Top {len(results)} of {pool_size} resumes\n")
+    for rank, item in enumerate(results, start=1):
+        print(f"{rank:>4}. {item['score']:6.2f}%  {os.path.basename(item['id'])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Typed outputs for the LLM prompts in prompts.py.
+
+Each model is sent to the API as a strict JSON schema, which requires every field,
+so none of them have defaults.
+"""
+from typing import List, Literal
+
+from pydantic import BaseModel, Field
+
+
+class ResumeExtraction(BaseModel):
+    skills: List[str] = Field(description="All relevant skills")
+    projects: List[str] = Field(description="Key project titles or descriptions")
+    experience: List[str] = Field(
+        description="Work experience as short lines: role, organization, duration and the main tools or achievements"
+    )
+
+
+class JDExtraction(BaseModel):
+    skills: List[str] = Field(description="All relevant skills")
+    responsibilities: List[str] = Field(description="Key responsibilities or requirements")
+
+
+class SuggestedRole(BaseModel):
+    role: str
+    reason: str
+
+
+class SkillMatch(BaseModel):
+    matched_skills: List[str]
+    unmatched_skills: List[str]
+    matched_responsibilities: List[str]
+    unmatched_responsibilities: List[str]
+    matching_points: List[str]
+    missing_points: List[str]
+    suggested_roles: List[SuggestedRole]
+
+
+class Verdict(BaseModel):
+    question: str
+    verdict: Literal["✅", "❌"]
+    reason: str
+
+
+class RoleWithReason(BaseModel):
+    title: str
+    reason: str
+
+
+class CandidateReview(BaseModel):
+    llm_verdicts: List[Verdict]
+    realistic_roles_with_reasons: List[RoleWithReason]
+    advisor_suggestions: List[str]
+    career_improvement_tips: List[str]
+    verified_skill_verdicts: List[str] = Field(description='One "<skill>: Verified" or "<skill>: Not Verified" per key skill')
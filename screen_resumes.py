@@ -0,0 +1,218 @@
+"""Bulk screening: run the full LangGraph analysis for every resume in a batch.
+
+Jobs live in a durable SQLite queue (utils/job_queue.py) that any number of worker
+processes on this machine can drain. A worker renews its job's lease while the
+graph runs. Each job checkpoints after every graph node (thread_id = job id), so a
+worker crash only loses the node in flight: the job's lease expires, another worker
+claims it and resumes from the last checkpoint.
+
+Usage:
+    python screen_resumes.py enqueue sample_data/sample_jd.txt path/to/resumes --batch nightly
+    python screen_resumes.py enqueue jd.txt path/to/resumes --batch nightly --shortlist 100
+    python screen_resumes.py work --batch nightly --processes 4     # run again to add workers on this host
+    python screen_resumes.py status --batch nightly
+    python screen_resumes.py export --batch nightly --out nightly.parquet
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import socket
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+from config import JOB_QUEUE_PATH, JOB_CHECKPOINT_PATH, JOB_MAX_ATTEMPTS, JOB_LEASE_SECONDS, SHORTLIST_SIZE
+from utils.job_queue import SQLiteJobQueue
+
+RESULT_FIELDS = [
+    "semantic_match_score", "matched_skills", "unmatched_skills", "matching_points",
+    "missing_points", "realistic_roles_with_reasons", "career_improvement_tips",
+]
+
+
+def open_queue(path=None):
+    return SQLiteJobQueue(path or JOB_QUEUE_PATH, lease_seconds=JOB_LEASE_SECONDS, max_attempts=JOB_MAX_ATTEMPTS)
+
+
+def open_checkpointer(path=None):
+    try:
+        from langgraph.checkpoint.sqlite import SqliteSaver
+    except ImportError:
+        print("⚠️ langgraph-checkpoint-sqlite is not installed; checkpoints are kept in memory "
+              "and a crashed job restarts from its first node")
+        from langgraph.checkpoint.memory import InMemorySaver
+        return InMemorySaver()
+    path = path or JOB_CHECKPOINT_PATH
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return SqliteSaver(sqlite3.connect(path, check_same_thread=False))
+
+
+def shortlist_paths(jd_text, resume_dir, size):
+    """The `size` resumes in `resume_dir` worth a full analysis: BM25 prefilter, then embeddings."""
+    from match_engine import cascade_rank
+    from rank_resumes import load_resumes
+    from utils.text_index import open_text_index
+
+    ids, texts = load_resumes(resume_dir)
+    # The keyword stage keeps a few times more than the final cut for embeddings to re-rank
+    ranked = cascade_rank(jd_text, texts, open_text_index(), [os.path.abspath(p) for p in ids],
+                          shortlist=max(size * 4, SHORTLIST_SIZE), top_k=size)
+    return [item["id"] for item in ranked]
+
+
+def run_job(graph, job_id, payload, jd_text):
+    """Run (or resume) one job's graph and return its result row."""
+    from utils.pdf_utils import extract_text_from_pdf
+
+    config = {"configurable": {"thread_id": job_id}}
+    snapshot = graph.get_state(config)
+    if snapshot.next:
+        # A previous attempt died mid-run: continue from its last checkpoint
+        state = graph.invoke(None, config)
+    elif snapshot.values:
+        # It finished but the result was never recorded
+        state = snapshot.values
+    else:
+        resume_text = extract_text_from_pdf(payload["resume_path"])
+        state = graph.invoke({"resume_text": resume_text, "jd_text": jd_text}, config)
+    return {field: state.get(field) for field in RESULT_FIELDS}
+
+
+@contextmanager
+def keep_leased(queue, job_id, worker):
+    """Renew the job's lease in the background while the body runs, so a long job isn't re-queued."""
+    stop = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(max(queue.lease_seconds / 3, 1)):
+            if not queue.extend_lease(job_id, worker):
+                return  # another worker has it now; our outcome won't be recorded
+
+    thread = threading.Thread(target=heartbeat, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+
+def work(batch, queue_path=None, checkpoint_path=None):
+    """Drain `batch` in this process; returns the number of jobs completed."""
+    from graphs.resume_match_graph import build_graph
+    from utils.telemetry import start_trace
+
+    queue = open_queue(queue_path)
+    jd_text = queue.batch_jd(batch)
+    if jd_text is None:
+        raise ValueError(f"Unknown batch: {batch}")
+    checkpointer = open_checkpointer(checkpoint_path)
+    graph = build_graph(checkpointer=checkpointer)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+
+    done = 0
+    while True:
+        claimed = queue.claim(batch, worker)
+        if claimed is None:
+            return done
+        job_id, payload, attempt = claimed
+        name = os.path.basename(payload["resume_path"])
+        try:
+            with keep_leased(queue, job_id, worker), start_trace(request_id=job_id):
+                result = run_job(graph, job_id, payload, jd_text)
+        except Exception as e:
+            print(f"⚠️ {name} failed (attempt {attempt}): {e}")
+            queue.fail(job_id, worker, f"{type(e).__name__}: {e}")
+            continue
+        if not queue.complete(job_id, worker, result):
+            print(f"⚠️ Lost the lease on {name}; another worker's outcome stands")
+            continue
+        checkpointer.delete_thread(job_id)  # the result is stored; the checkpoints are no longer needed
+        done += 1
+
+
+def export_results(queue, batch, out_path):
+    """Write finished results, best score first, as Parquet (or JSON lines without pyarrow)."""
+    rows = [
+        {"job_id": job_id, "resume_path": payload["resume_path"], **result}
+        for job_id, payload, result in queue.results(batch)
+    ]
+    rows.sort(key=lambda r: r.get("semantic_match_score") or 0.0, reverse=True)
+    for row in rows:
+        # Nested dicts don't map cleanly onto columns; keep roles as JSON strings
+        row["realistic_roles_with_reasons"] = [
+            json.dumps(role, ensure_ascii=False) for role in row.get("realistic_roles_with_reasons") or []
+        ]
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        out_path = os.path.splitext(out_path)[0] + ".jsonl"
+        print(f"⚠️ pyarrow is not installed; writing JSON lines to {out_path}")
+        with open(out_path, "w", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+        return out_path, len(rows)
+    pq.write_table(pa.Table.from_pylist(rows), out_path)
+    return out_path, len(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Queue-backed bulk resume screening.")
+    parser.add_argument("--queue", default=JOB_QUEUE_PATH, help="Job queue database")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    enqueue = commands.add_parser("enqueue", help="Create a batch from a JD and a directory of PDFs")
+    enqueue.add_argument("jd_path")
+    enqueue.add_argument("resume_dir")
+    enqueue.add_argument("--batch", required=True)
+    enqueue.add_argument("--shortlist", type=int, default=0,
+                         help="Only queue the N best resumes by keyword prefilter + embedding score (0 = all)")
+
+    worker = commands.add_parser("work", help="Process jobs until the batch is drained")
+    worker.add_argument("--batch", required=True)
+    worker.add_argument("--processes", type=int, default=1)
+    worker.add_argument("--checkpoints", default=JOB_CHECKPOINT_PATH, help="Checkpoint database")
+
+    status = commands.add_parser("status", help="Show job counts for a batch")
+    status.add_argument("--batch", required=True)
+
+    export = commands.add_parser("export", help="Write finished results to a Parquet file")
+    export.add_argument("--batch", required=True)
+    export.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    queue = open_queue(args.queue)
+    if args.command == "enqueue":
+        with open(args.jd_path, "r", encoding="utf-8") as f:
+            jd_text = f.read()
+        queue.create_batch(args.batch, jd_text)
+        paths = sorted(
+            os.path.abspath(os.path.join(args.resume_dir, name))
+            for name in os.listdir(args.resume_dir)
+            if name.lower().endswith(".pdf")
+        )
+        if args.shortlist:
+            paths = shortlist_paths(jd_text, args.resume_dir, args.shortlist)
+        added = queue.enqueue(args.batch, [{"resume_path": p} for p in paths])
+        print(f"📥 {added} new job(s) queued ({len(paths) - added} already in the batch)")
+    elif args.command == "work":
+        if args.processes > 1:
+            # spawn: each worker loads its own models and opens its own connections
+            ctx = multiprocessing.get_context("spawn")
+            with ctx.Pool(args.processes) as pool:
+                done = sum(pool.starmap(work, [(args.batch, args.queue, args.checkpoints)] * args.processes))
+        else:
+            done = work(args.batch, args.queue, args.checkpoints)
+        print(f"✅ Completed {done} job(s); status: {queue.counts(args.batch)}")
+    elif args.command == "status":
+        print(json.dumps(queue.counts(args.batch), indent=2))
+    elif args.command == "export":
+        out_path, count = export_results(queue, args.batch, args.out)
+        print(f"💾 Wrote {count} result(s) to {out_path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""Headless HTTP API for the resume match pipeline.
+
+Run with several workers behind a load balancer:
+    uvicorn service:api --host 0.0.0.0 --port 8000 --workers 4
+
+Endpoints:
+    POST /score    {"resume_text", "jd_text"}                -> embedding match score
+    POST /rank     {"jd_text", "resume_texts", "top_k"}      -> ranked resumes
+    POST /analyze  {"resume_text" | "resume_pdf_base64", "jd_text"} -> full LangGraph analysis
+    GET  /healthz  liveness, GET /readyz readiness, GET /metrics Prometheus metrics
+"""
+import asyncio
+import base64
+from contextlib import asynccontextmanager
+from typing import List, Optional
+
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import JSONResponse, PlainTextResponse
+from pydantic import BaseModel
+
+from config import SERVICE_BATCH_SIZE, SERVICE_BATCH_WAIT_MS
+from match_engine import score_pairs, rank_resumes
+from utils.batching import MicroBatcher
+from utils.model_registry import get_sentence_model
+from utils.pdf_utils import extract_text_from_pdf
+from utils.telemetry import render_prometheus, start_trace
+
+score_batcher = MicroBatcher(score_pairs, max_batch_size=SERVICE_BATCH_SIZE, max_wait_ms=SERVICE_BATCH_WAIT_MS)
+readiness = {"embeddings": False, "graph": False, "error": None}
+_graph = None
+
+
+def _load_graph():
+    # The graph pulls in the LLM stack; load it off the event loop
+    global _graph
+    if _graph is None:
+        from graphs.resume_match_graph import app as resume_graph
+        _graph = resume_graph
+    return _graph
+
+
+async def _warm_up():
+    try:
+        await asyncio.to_thread(get_sentence_model)
+        readiness["embeddings"] = True
+        await asyncio.to_thread(_load_graph)
+        readiness["graph"] = True
+    except Exception as e:
+        readiness["error"] = f"{type(e).__name__}: {e}"
+
+
+@asynccontextmanager
+async def lifespan(_):
+    score_batcher.start()
+    warm_up = asyncio.create_task(_warm_up())
+    yield
+    warm_up.cancel()
+    await score_batcher.stop()
+
+
+api = FastAPI(title="Resume Match AI", lifespan=lifespan)
+
+
+class ScoreRequest(BaseModel):
+    resume_text: str
+    jd_text: str
+
+
+class RankRequest(BaseModel):
+    jd_text: str
+    resume_texts: List[str]
+    ids: Optional[List[str]] = None
+    top_k: int = 20
+
+
+class AnalyzeRequest(BaseModel):
+    jd_text: str
+    resume_text: Optional[str] = None
+    resume_pdf_base64: Optional[str] = None
+
+
+@api.get("/healthz")
+async def healthz():
+    return {"status": "ok"}
+
+
+@api.get("/readyz")
+async def readyz():
+    ready = readiness["embeddings"] and readiness["graph"]
+    return JSONResponse(readiness, status_code=200 if ready else 503)
+
+
+@api.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return render_prometheus()
+
+
+@api.post("/score")
+async def score(request: ScoreRequest):
+    # Concurrent /score calls are coalesced into a single encode by the micro-batcher
+    return {"score": await score_batcher.submit((request.resume_text, request.jd_text))}
+
+
+@api.post("/rank")
+async def rank(request: RankRequest):
+    if request.ids is not None and len(request.ids) != len(request.resume_texts):
+        raise HTTPException(status_code=422, detail="ids and resume_texts must be the same length")
+    results = await asyncio.to_thread(
+        rank_resumes, request.jd_text, request.resume_texts, request.top_k, SERVICE_BATCH_SIZE, request.ids
+    )
+    return {"results": results}
+
+
+@api.post("/analyze")
+async def analyze(request: AnalyzeRequest):
+    if request.resume_text:
+        resume_text = request.resume_text
+    elif request.resume_pdf_base64:
+        try:
+            pdf_bytes = base64.b64decode(request.resume_pdf_base64)
+            resume_text = await asyncio.to_thread(extract_text_from_pdf, pdf_bytes)
+        except Exception as e:
+            raise HTTPException(status_code=422, detail=f"Could not read resume PDF: {e}")
+    else:
+        raise HTTPException(status_code=422, detail="Provide resume_text or resume_pdf_base64")
+
+    graph = await asyncio.to_thread(_load_graph)
+    with start_trace() as trace:
+        result = await graph.ainvoke({"resume_text": resume_text, "jd_text": request.jd_text})
+    return {
+        "request_id": trace.request_id,
+        "result": result,
+        "usage": trace.to_dict()["totals"],
+    }
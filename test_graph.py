@@ -1,10 +1,10 @@
+import json
 from graphs.resume_match_graph import app
-import fitz  # PyMuPDF
+from utils.telemetry import start_trace
+from utils.pdf_utils import extract_text_from_pdf
 
 # Load resume
-with open("sample_data/sample_resume.pdf", "rb") as f:
-    doc = fitz.open(stream=f.read(), filetype="pdf")
-    resume_text = "\n".join([page.get_text() for page in doc])
+resume_text = extract_text_from_pdf("sample_data/sample_resume.pdf")
 
 # Load JD
 with open("sample_data/sample_jd.txt", "r", encoding="utf-8") as f:
@@ -17,7 +17,8 @@ inputs = {
 }
 
 # Run graph
-result = app.invoke(inputs)
+with start_trace() as trace:
+    result = app.invoke(inputs)
 
 # --- Cleaned Final Output ---
 print("\n✅ Final Output\n")
@@ -47,3 +48,6 @@ else:
 print("\n🧠 Verified Skill Verdicts:")
 for item in result.get("verified_skill_verdicts", []):
     print("•", item)
+
+print("\n⏱️ Trace:")
+print(json.dumps(trace.to_dict(), indent=2, ensure_ascii=False))
@@ -0,0 +1,43 @@
+import threading
+
+from utils import analysis_runner
+from utils.analysis_runner import AnalysisRunner
+
+
+class BlockingGraph:
+    """Streams one update per run, after `release` is set."""
+
+    def __init__(self):
+        self.release = threading.Event()
+
+    def stream(self, inputs, stream_mode):
+        self.release.wait(10)
+        yield {"score": {"jd": inputs["jd_text"]}}
+
+
+def test_lru_evicts_only_finished_jobs(monkeypatch):
+    monkeypatch.setattr(analysis_runner, "extract_text_from_pdf", lambda data: data.decode())
+    graph = BlockingGraph()
+    runner = AnalysisRunner(graph, max_workers=4, max_results=2)
+
+    running = [runner.submit(b"resume", f"jd{i}".encode()) for i in range(3)]
+    # All three are still running, so none may be dropped
+    assert all(runner.get(job.key) is job for job in running)
+
+    graph.release.set()
+    for job in running:
+        assert job.done.wait(10)
+    latest = runner.submit(b"resume", b"jd3")
+    assert latest.done.wait(10)
+    assert [runner.get(job.key) for job in running] == [None, None, running[2]]
+    assert runner.get(latest.key).result == {"jd": "jd3"}
+
+
+def test_identical_uploads_share_a_job(monkeypatch):
+    monkeypatch.setattr(analysis_runner, "extract_text_from_pdf", lambda data: data.decode())
+    graph = BlockingGraph()
+    graph.release.set()
+    runner = AnalysisRunner(graph, max_workers=1, max_results=2)
+    job = runner.submit(b"resume", b"jd")
+    assert runner.submit(b"resume", b"jd") is job
+    assert job.done.wait(10) and job.completed == ["score"]
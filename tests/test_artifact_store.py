@@ -0,0 +1,49 @@
+import pytest
+
+from utils import artifact_store
+from utils.artifact_store import artifact_key, content_hash, load_or_compute
+from utils.cache_utils import DiskCache
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = DiskCache(str(tmp_path / "artifacts.sqlite3"), namespace="graph_artifacts")
+    monkeypatch.setattr(artifact_store, "_artifact_store", store)
+    return store
+
+
+def counting(value, reusable=True):
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return value, reusable
+    return compute, calls
+
+
+def test_reuses_stored_artifacts(store):
+    compute, calls = counting({"skills": ["Python"]})
+    assert load_or_compute("resume_data", ["h1"], compute) == {"skills": ["Python"]}
+    assert load_or_compute("resume_data", ["h1"], compute) == {"skills": ["Python"]}
+    assert len(calls) == 1
+    load_or_compute("resume_data", ["h2"], compute)
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("value, reusable", [({"skills": ["Python"]}, False), ({"skills": []}, True)])
+def test_fallback_and_empty_artifacts_are_not_stored(store, value, reusable):
+    compute, calls = counting(value, reusable)
+    assert load_or_compute("resume_data", ["h1"], compute) == value
+    load_or_compute("resume_data", ["h1"], compute)
+    assert len(calls) == 2
+    assert len(store) == 0
+
+
+def test_content_hash_keeps_line_structure():
+    assert content_hash("SKILLS\nPython\nSQL") != content_hash("SKILLS Python SQL")
+    assert content_hash({"a": 1, "b": [2]}) == content_hash({"b": [2], "a": 1})
+
+
+def test_key_covers_settings():
+    assert artifact_key("resume_data", "h1", "prompt-a", 2000) != artifact_key("resume_data", "h1", "prompt-b", 2000)
+    assert artifact_key("resume_data", "h1", "prompt-a", 2000) != artifact_key("resume_data", "h1", "prompt-a", 1000)
@@ -0,0 +1,52 @@
+from utils.cache_utils import DiskCache, make_cache_key
+
+
+def test_make_cache_key_ignores_cosmetic_whitespace():
+    assert make_cache_key("a  b\n", {"k": [" x "]}) == make_cache_key("a b", {"k": ["x"]})
+    assert make_cache_key("a b") != make_cache_key("a", "b")
+
+
+def test_round_trip_and_namespaces(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache, other = DiskCache(path, "llm"), DiskCache(path, "artifacts")
+    cache.set("k", {"skills": ["Python"]})
+    assert cache.get("k") == {"skills": ["Python"]}
+    assert other.get("k") is None and other.get("k", "x") == "x"
+    assert len(cache) == 1 and len(other) == 0
+    cache.clear()
+    assert cache.get("k") is None
+
+
+def test_ttl_expires_entries(tmp_path, clock):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), ttl_seconds=60)
+    cache.set("old", 1)
+    clock.now += 30
+    cache.set("new", 2)
+    clock.now += 31
+    assert cache.get("old") is None
+    assert cache.get("new") == 2
+    clock.now += 30
+    cache.set("newest", 3)  # writes also purge expired rows
+    assert len(cache) == 1
+    assert cache.stats()["evictions"] == 2
+
+
+def test_lru_evicts_least_recently_used(tmp_path, clock):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"), max_entries=2)
+    cache.set("a", 1)
+    clock.now += 1
+    cache.set("b", 2)
+    clock.now += 1
+    assert cache.get("a") == 1  # now "b" is the least recently used
+    clock.now += 1
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert (cache.get("a"), cache.get("c")) == (1, 3)
+
+
+def test_stats_count_hits_and_misses(tmp_path):
+    cache = DiskCache(str(tmp_path / "cache.sqlite3"))
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("missing")
+    assert cache.stats() == {"hits": 1, "misses": 1, "evictions": 0, "hit_rate": 0.5, "entries": 1}
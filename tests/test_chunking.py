@@ -0,0 +1,66 @@
+import random
+
+import pytest
+
+from utils import chunking
+from utils.chunking import (
+    chunk_sections,
+    compress_for_prompt,
+    count_tokens,
+    dedupe_lines,
+    fits_budget,
+    split_sections,
+)
+
+WORDS = "python aws docker kafka built led designed scaled pipelines latency team customers".split()
+
+
+@pytest.fixture(autouse=True)
+def estimated_tokens(monkeypatch):
+    # The ~4 chars/token estimate: deterministic and needs no tiktoken download
+    monkeypatch.setattr(chunking, "_encoding", lambda: None)
+
+
+@pytest.fixture
+def resume():
+    rng = random.Random(0)
+    sections = []
+    for title in ["SUMMARY", "EXPERIENCE", "PROJECTS", "SKILLS", "EDUCATION", "CERTIFICATIONS"]:
+        lines = [" ".join(rng.choice(WORDS) for _ in range(rng.randint(3, 30))) + f" #{i}" for i in range(80)]
+        sections.append(title + "\n" + "\n".join(lines))
+    return "\n\n".join(sections)
+
+
+def test_dedupe_lines_drops_repeats_and_boilerplate():
+    text = "Jane Doe - Senior Data Engineer\nPage 1 of 2\nBuilt things\nJane Doe - Senior Data Engineer\nSQL\nSQL"
+    assert dedupe_lines(text) == "Jane Doe - Senior Data Engineer\nBuilt things\nSQL\nSQL"
+
+
+def test_split_sections():
+    text = "Jane Doe\nSKILLS\nPython, SQL\nExperience:\nAcme 2020-2023"
+    assert split_sections(text) == [("", "Jane Doe"), ("SKILLS", "Python, SQL"), ("Experience", "Acme 2020-2023")]
+
+
+def test_chunks_respect_max_tokens():
+    lines = "\n".join("x" * 40 for _ in range(10))  # 10 tokens per line
+    chunks = chunk_sections([("SKILLS", lines)], max_tokens=30)
+    assert [c["text"].count("\n") for c in chunks] == [3, 3, 3, 1]
+    assert all(c["text"].startswith("SKILLS:\n") for c in chunks)
+
+
+def test_short_text_is_only_cleaned(resume):
+    assert compress_for_prompt("SKILLS\nPython\nPage 3", budget=100) == "SKILLS\nPython"
+    assert compress_for_prompt(resume, budget=0) == dedupe_lines(resume)
+
+
+@pytest.mark.parametrize("budget", list(range(20, 3000, 37)) + [1, 5])
+def test_compressed_text_fits_budget(resume, budget):
+    compressed = compress_for_prompt(resume, budget=budget)
+    assert fits_budget(compressed, budget)
+    assert count_tokens(compressed) <= budget
+
+
+def test_priority_sections_are_kept_first(resume):
+    compressed = compress_for_prompt(resume, budget=400, priority_sections=("skills",))
+    assert split_sections(compressed)[0][0] == "SKILLS"
+    assert {title for title, _ in split_sections(compressed)} == {"SKILLS"}
@@ -0,0 +1,89 @@
+import pytest
+
+from utils.job_queue import SQLiteJobQueue
+
+
+@pytest.fixture
+def queue(tmp_path, clock):
+    queue = SQLiteJobQueue(str(tmp_path / "jobs.sqlite3"), lease_seconds=60, max_attempts=2)
+    queue.create_batch("b", "JD")
+    return queue
+
+
+def test_enqueue_is_idempotent(queue):
+    assert queue.enqueue("b", [{"n": 1}, {"n": 2}]) == 2
+    assert queue.enqueue("b", [{"n": 2}, {"n": 3}]) == 1
+    assert queue.counts("b") == {"pending": 3}
+
+
+def test_create_batch_keeps_the_first_jd(queue):
+    queue.create_batch("b", "JD")
+    with pytest.raises(ValueError):
+        queue.create_batch("b", "another JD")
+    assert queue.batch_jd("b") == "JD"
+
+
+def test_claim_and_complete(queue):
+    queue.enqueue("b", [{"n": 1}])
+    job_id, payload, attempt = queue.claim("b", "w1")
+    assert (payload, attempt) == ({"n": 1}, 1)
+    assert queue.claim("b", "w2") is None
+    assert queue.complete(job_id, "w1", {"score": 1})
+    assert queue.counts("b") == {"done": 1}
+    assert list(queue.results("b")) == [(job_id, {"n": 1}, {"score": 1})]
+
+
+def test_expired_lease_is_reclaimed_and_old_owner_is_ignored(queue, clock):
+    queue.enqueue("b", [{"n": 1}])
+    job_id, _, _ = queue.claim("b", "w1")
+    clock.now += 61
+    assert queue.claim("b", "w2")[0::2] == (job_id, 2)
+    assert not queue.extend_lease(job_id, "w1")
+    assert not queue.complete(job_id, "w1", {"score": "stale"})
+    assert not queue.fail(job_id, "w1", "stale")
+    assert queue.complete(job_id, "w2", {"score": 2})
+    assert [r for _, _, r in queue.results("b")] == [{"score": 2}]
+
+
+def test_extend_lease_keeps_a_running_job(queue, clock):
+    queue.enqueue("b", [{"n": 1}])
+    job_id, _, _ = queue.claim("b", "w1")
+    for _ in range(3):
+        clock.now += 40
+        assert queue.extend_lease(job_id, "w1")
+        assert queue.claim("b", "w2") is None
+    assert queue.complete(job_id, "w1", {})
+
+
+def test_fail_requeues_until_attempts_are_used_up(queue, clock):
+    queue.enqueue("b", [{"n": 1}])
+    job_id, _, _ = queue.claim("b", "w1")
+    assert queue.fail(job_id, "w1", "boom")
+    assert queue.counts("b") == {"pending": 1}
+    job_id, _, attempt = queue.claim("b", "w1")
+    assert attempt == 2
+    assert queue.fail(job_id, "w1", "boom")
+    assert queue.counts("b") == {"failed": 1}
+    assert queue.claim("b", "w1") is None
+
+
+def test_abandoned_last_attempt_is_marked_failed(queue, clock):
+    queue.enqueue("b", [{"n": 1}])
+    for _ in range(2):
+        queue.claim("b", "w1")
+        clock.now += 61
+    assert queue.claim("b", "w2") is None
+    assert queue.counts("b") == {"failed": 1}
+
+
+def test_failed_claim_rolls_back(queue, clock):
+    queue.enqueue("b", [{"n": 1}])
+    for _ in range(2):
+        queue.claim("b", "w1")
+        clock.now += 61
+    queue.enqueue("b", [{"n": 2}])
+    queue.lease_seconds = None  # breaks the claim after it expired the abandoned job
+    with pytest.raises(TypeError):
+        queue.claim("b", "w2")
+    assert not queue._conn.in_transaction
+    assert queue.counts("b") == {"pending": 1, "running": 1}
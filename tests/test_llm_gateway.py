@@ -0,0 +1,144 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+from langchain_core.messages import AIMessage
+
+from utils import llm_gateway
+from utils.llm_gateway import LLMError, TokenBucket, _backoff_seconds, _is_retryable, ainvoke_llm, invoke_llm
+
+REQUEST = httpx.Request("POST", "https://api.openai.com/v1/chat/completions")
+
+
+def status_error(cls, status, headers=None):
+    return cls("boom", response=httpx.Response(status, request=REQUEST, headers=headers), body=None)
+
+
+def reply(text="{}"):
+    return AIMessage(content=text, usage_metadata={"input_tokens": 3, "output_tokens": 1, "total_tokens": 4})
+
+
+class ScriptedLLM:
+    """Returns (or raises) the scripted outcomes in order, one per call."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        outcome = self.outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    async def ainvoke(self, prompt):
+        return self.invoke(prompt)
+
+
+@pytest.fixture
+def gateway(monkeypatch, clock):
+    monkeypatch.setattr(llm_gateway, "_rate_limiter", None)
+    monkeypatch.setattr(llm_gateway, "LLM_MAX_RETRIES", 2)
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_BASE_SECONDS", 1.0)
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_MAX_SECONDS", 30.0)
+
+    async def fake_sleep(seconds):
+        clock.sleep(seconds)
+    monkeypatch.setattr(llm_gateway.asyncio, "sleep", fake_sleep)
+
+    def install(*outcomes):
+        llm = ScriptedLLM(*outcomes)
+        monkeypatch.setattr(llm_gateway, "_llm", llm)
+        return llm
+    return install
+
+
+def test_token_bucket_allows_a_burst_then_paces(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    bucket.acquire()
+    bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+def test_token_bucket_refills_over_time(clock):
+    bucket = TokenBucket(rate=2.0, capacity=2)
+    for _ in range(2):
+        bucket.acquire()
+    clock.now += 10  # refills to capacity, not beyond
+    for _ in range(2):
+        bucket.acquire()
+    assert clock.sleeps == []
+    bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.5)]
+
+
+@pytest.mark.parametrize("error, retryable", [
+    (status_error(openai.RateLimitError, 429), True),
+    (status_error(openai.InternalServerError, 503), True),
+    (openai.APIConnectionError(request=REQUEST), True),
+    (httpx.ReadTimeout("slow", request=REQUEST), True),
+    (status_error(openai.BadRequestError, 400), False),
+    (status_error(openai.AuthenticationError, 401), False),
+    (ValueError("bad prompt"), False),
+])
+def test_is_retryable(error, retryable):
+    assert _is_retryable(error) is retryable
+
+
+def test_backoff_grows_with_jitter_and_is_capped(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_BASE_SECONDS", 1.0)
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_MAX_SECONDS", 30.0)
+    error = status_error(openai.InternalServerError, 500)
+    for attempt, full in [(0, 1.0), (3, 8.0), (10, 30.0)]:
+        assert full * 0.5 <= _backoff_seconds(error, attempt) <= full
+
+
+def test_backoff_honours_retry_after(monkeypatch):
+    monkeypatch.setattr(llm_gateway, "LLM_BACKOFF_MAX_SECONDS", 30.0)
+    assert _backoff_seconds(status_error(openai.RateLimitError, 429, {"retry-after": "7"}), 0) == 7.0
+    assert _backoff_seconds(status_error(openai.RateLimitError, 429, {"retry-after": "600"}), 0) == 30.0
+    # An HTTP date isn't parsed; fall back to exponential backoff
+    assert 0.5 <= _backoff_seconds(status_error(openai.RateLimitError, 429, {"retry-after": "Wed, 21 Oct"}), 0) <= 1.0
+
+
+def test_retries_transient_errors(gateway, clock):
+    llm = gateway(status_error(openai.RateLimitError, 429, {"retry-after": "2"}),
+                  openai.APIConnectionError(request=REQUEST), reply("ok"))
+    assert invoke_llm("prompt").content == "ok"
+    assert llm.calls == 3
+    assert clock.sleeps[0] == 2.0 and 1.0 <= clock.sleeps[1] <= 2.0
+
+
+def test_gives_up_after_the_retry_budget(gateway):
+    llm = gateway(*[status_error(openai.InternalServerError, 500)] * 5)
+    with pytest.raises(LLMError, match="after 3 attempt"):
+        invoke_llm("prompt")
+    assert llm.calls == 3
+
+
+def test_non_retryable_errors_fail_at_once(gateway, clock):
+    llm = gateway(status_error(openai.BadRequestError, 400), reply())
+    with pytest.raises(LLMError, match="after 1 attempt") as info:
+        invoke_llm("prompt")
+    assert isinstance(info.value.__cause__, openai.BadRequestError)
+    assert llm.calls == 1 and clock.sleeps == []
+
+
+def test_telemetry_failure_does_not_retry_a_completed_call(gateway, monkeypatch):
+    def broken(*args, **kwargs):
+        raise RuntimeError("metrics backend down")
+    monkeypatch.setattr(llm_gateway, "record_llm_call", broken)
+    llm = gateway(reply("ok"), reply("again"))
+    assert invoke_llm("prompt").content == "ok"
+    assert asyncio.run(ainvoke_llm("prompt")).content == "again"
+    assert llm.calls == 2
+
+
+def test_async_retries(gateway, clock):
+    llm = gateway(status_error(openai.InternalServerError, 502), reply("ok"))
+    assert asyncio.run(ainvoke_llm("prompt")).content == "ok"
+    assert llm.calls == 2 and len(clock.sleeps) == 1
@@ -0,0 +1,85 @@
+import asyncio
+from typing import List
+
+import pytest
+from langchain_core.messages import AIMessage
+from pydantic import BaseModel
+
+from utils import llm_utils
+from utils.cache_utils import DiskCache
+from utils.llm_utils import acall_llm_json, call_llm_json
+
+
+class Extraction(BaseModel):
+    skills: List[str]
+
+
+class FakeStructuredLLM:
+    """Mimics `get_structured_llm(schema).invoke`: one scripted reply text per call."""
+
+    def __init__(self, *replies):
+        self.replies = list(replies)
+        self.requests = []
+
+    def __call__(self, prompt, schema=None):
+        self.requests.append(prompt)
+        content = self.replies.pop(0)
+        try:
+            parsed, error = schema.model_validate_json(content), None
+        except ValueError as e:
+            parsed, error = None, e
+        return {"raw": AIMessage(content=content), "parsed": parsed, "parsing_error": error}
+
+    async def acall(self, prompt, schema=None):
+        return self(prompt, schema)
+
+
+@pytest.fixture
+def llm(tmp_path, monkeypatch):
+    cache = DiskCache(str(tmp_path / "llm.sqlite3"), namespace="llm_json")
+    monkeypatch.setattr(llm_utils, "get_llm_cache", lambda: cache)
+    monkeypatch.setattr(llm_utils, "get_semantic_cache", lambda results: None)
+    monkeypatch.setattr(llm_utils, "LLM_REPAIR_ATTEMPTS", 2)
+    outcomes = []
+    monkeypatch.setattr(llm_utils, "record_llm_output", outcomes.append)
+
+    def install(*replies):
+        fake = FakeStructuredLLM(*replies)
+        monkeypatch.setattr(llm_utils, "invoke_llm", fake)
+        monkeypatch.setattr(llm_utils, "ainvoke_llm", fake.acall)
+        return fake
+    install.cache = cache
+    install.outcomes = outcomes
+    return install
+
+
+def test_salvages_json_wrapped_in_prose(llm):
+    fake = llm('Sure! ```json\n{"skills": ["Python"]}\n```')
+    assert call_llm_json("Extract from {text}", {"text": "cv"}, schema=Extraction) == {"skills": ["Python"]}
+    assert len(fake.requests) == 1
+    assert llm.outcomes == ["ok"]
+
+
+def test_repairs_an_invalid_reply(llm):
+    fake = llm('{"skills": "Python"}', '{"skills": ["Python"]}')
+    assert call_llm_json("Extract from {text}", {"text": "cv"}, schema=Extraction) == {"skills": ["Python"]}
+    assert len(fake.requests) == 2
+    repair = fake.requests[1]
+    assert repair.startswith("Extract from cv") and "could not be used" in repair and '"skills": "Python"' in repair
+    assert llm.outcomes == ["repaired"]
+    assert len(llm.cache) == 1
+
+
+def test_async_repair(llm):
+    fake = llm("not json", '{"skills": ["SQL"]}')
+    assert asyncio.run(acall_llm_json("Extract from {text}", {"text": "cv"}, schema=Extraction)) == {"skills": ["SQL"]}
+    assert len(fake.requests) == 2
+    assert llm.outcomes == ["repaired"]
+
+
+def test_gives_up_after_the_repair_budget(llm):
+    fake = llm("not json", "[1, 2]", '{"other": 1}', '{"skills": ["never asked for"]}')
+    assert call_llm_json("Extract from {text}", {"text": "cv"}, schema=Extraction) == {}
+    assert len(fake.requests) == 3  # the first call plus LLM_REPAIR_ATTEMPTS repairs
+    assert llm.outcomes == ["failed"]
+    assert len(llm.cache) == 0
@@ -0,0 +1,31 @@
+import numpy as np
+import pytest
+
+import match_engine
+from match_engine import cascade_rank
+from utils.text_index import TextIndex
+
+
+def letter_counts(texts, model=None, batch_size=64):
+    # Stand-in for embed_documents: normalized letter histograms
+    embs = np.array([[t.lower().count(c) for c in "abcdefghijklmnopqrstuvwxyz"] for t in texts], dtype=np.float32)
+    return embs / np.maximum(np.linalg.norm(embs, axis=1, keepdims=True), 1e-12)
+
+
+@pytest.fixture
+def index(tmp_path, monkeypatch):
+    monkeypatch.setattr(match_engine, "embed_documents", letter_counts)
+    return TextIndex(str(tmp_path / "text_index.sqlite3"))
+
+
+def test_cascade_embeds_only_the_shortlist(index):
+    texts = ["python developer building apis", "python data engineer", "pastry chef", "florist"]
+    ranked = cascade_rank("senior python engineer", texts, index, ["a", "b", "c", "d"], shortlist=2)
+    assert {r["id"] for r in ranked} == {"a", "b"}
+
+
+def test_cascade_falls_back_to_embeddings_without_keyword_overlap(index):
+    texts = ["pastry chef", "florist", "barista"]
+    ranked = cascade_rank("senior python engineer", texts, index, ["a", "b", "c"], shortlist=2, top_k=2)
+    assert len(ranked) == 2
+    assert ranked[0]["score"] >= ranked[1]["score"]
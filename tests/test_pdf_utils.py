@@ -0,0 +1,10 @@
+from utils.pdf_utils import extract_texts_from_pdfs
+
+
+def test_unreadable_pdfs_are_reported_without_their_bytes(capsys):
+    data = b"%PDF-not-really" * 100
+    results = list(extract_texts_from_pdfs([data, "missing.pdf"], max_workers=1))
+    assert [text for _, text in results] == [None, None]
+    out = capsys.readouterr().out
+    assert f"PDF #0 ({len(data)} bytes)" in out and "missing.pdf" in out
+    assert "not-really" not in out
@@ -0,0 +1,62 @@
+import pytest
+
+from utils.skill_taxonomy import SkillTaxonomy, get_taxonomy
+
+
+@pytest.fixture
+def taxonomy():
+    return get_taxonomy()
+
+
+@pytest.mark.parametrize("skill, expected", [
+    ("JS", "JavaScript"),
+    ("javascript (ES6)", "JavaScript"),
+    ("Python 3.11", "Python"),
+    ("python 3.x", "Python"),
+    ("Node v18", "Node.js"),
+    ("amazon  web services", "AWS"),
+])
+def test_canonicalize_whole_phrase_aliases(taxonomy, skill, expected):
+    assert taxonomy.canonicalize(skill) == expected
+
+
+@pytest.mark.parametrize("skill", [
+    "AWS Lambda",
+    "Azure DevOps",
+    "Docker Compose",
+    "MongoDB Atlas",
+    "Google Cloud Run",
+    "Go-to-market strategy",
+    "Not Java",
+])
+def test_canonicalize_keeps_phrases_that_only_contain_a_skill(taxonomy, skill):
+    assert taxonomy.canonicalize(skill) == skill
+
+
+def test_canonicalize_cleans_unknown_phrases(taxonomy):
+    assert taxonomy.canonicalize("  Stakeholder \n management ") == "Stakeholder management"
+
+
+def test_canonicalize_all_dedupes(taxonomy):
+    assert taxonomy.canonicalize_all(["JS", "JavaScript", "Python 3"]) == ["JavaScript", "Python"]
+
+
+def test_extract_whole_terms_only(taxonomy):
+    assert taxonomy.extract("Skilled in R and Python, C++/Java") == ["R", "Python", "C++", "Java"]
+    assert "Java" not in taxonomy.extract("Built SPAs in JavaScript")
+
+
+@pytest.mark.parametrize("text", ["Led R&D for the platform team", "Owned the go-to-market plan"])
+def test_extract_ignores_terms_inside_words(taxonomy, text):
+    assert taxonomy.extract(text) == []
+
+
+def test_find_reports_spans(taxonomy):
+    text = "Used JS daily"
+    assert [(text[s:e], c) for s, e, c in taxonomy.find(text)] == [("JS", "JavaScript")]
+
+
+def test_case_sensitive_terms():
+    taxonomy = SkillTaxonomy({"Go": ["golang"]}, case_sensitive=["Go"])
+    assert taxonomy.extract("go to the Go meetup, write golang") == ["Go"]
+    assert [c for _, _, c in taxonomy.find("let's go")] == []
@@ -0,0 +1,83 @@
+import pytest
+
+from utils.text_index import TextIndex, tokenize
+
+
+@pytest.fixture
+def index(tmp_path):
+    return TextIndex(str(tmp_path / "text_index.sqlite3"))
+
+
+def ids(results):
+    return [doc_id for doc_id, _ in results]
+
+
+def test_tokenize_keeps_technical_terms_whole():
+    assert tokenize("C++ and Node.js with CI-CD, the usual") == ["c++", "node.js", "ci-cd", "usual"]
+
+
+def test_search_ranks_matching_documents(index):
+    assert index.add_many([
+        ("a", "Python developer building Django APIs"),
+        ("b", "Java developer on Spring services"),
+        ("c", "Barista with latte art experience"),
+    ]) == 3
+    results = index.search("python django", limit=10)
+    assert ids(results) == ["a"]
+    assert results[0][1] > 0
+    assert "c" not in ids(index.search("developer", limit=10))
+
+
+def test_skill_aliases_share_a_term(index):
+    index.add("a", "Frontend work in JS and TS")
+    assert ids(index.search("JavaScript", limit=5)) == ["a"]
+
+
+def test_unchanged_documents_are_skipped_and_changed_ones_replaced(index):
+    index.add("a", "python developer")
+    assert index.add_many([("a", "python developer")]) == 0
+    assert index.add("a", "rust developer")
+    assert len(index) == 1
+    assert index.search("python") == []
+    assert ids(index.search("rust")) == ["a"]
+
+
+def test_remove(index):
+    index.add_many([("a", "python developer"), ("b", "python engineer")])
+    index.remove("a")
+    assert len(index) == 1
+    assert ids(index.search("python")) == ["b"]
+
+
+def test_within_restricts_results(index):
+    index.add_many([("a", "python developer"), ("b", "python engineer")])
+    assert ids(index.search("python", within={"b"})) == ["b"]
+
+
+def test_optimize_merges_segments_without_changing_results(index):
+    for i in range(5):
+        index.add(f"doc{i}", f"python developer number{i}")
+    index.add("doc0", "rust developer")
+    before = index.search("python developer", limit=10)
+    index.optimize()
+    assert index._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0] == 1
+    after = index.search("python developer", limit=10)
+    assert ids(after) == ids(before)
+    assert [score for _, score in after] == pytest.approx([score for _, score in before])
+    assert ids(index.search("rust")) == ["doc0"]
+
+
+def test_optimize_runs_automatically_past_max_segments(tmp_path):
+    index = TextIndex(str(tmp_path / "ti.sqlite3"), max_segments=3)
+    for i in range(5):
+        index.add(f"doc{i}", f"python developer {i}")
+    assert index._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0] <= 3
+    assert len(index.search("python", limit=10)) == 5
+
+
+def test_failed_batch_is_rolled_back(index):
+    with pytest.raises(AttributeError):
+        index.add_many([("a", "python developer with docker"), ("b", None)])
+    assert len(index) == 0
+    assert index.add("a", "python developer with docker")
+    assert ids(index.search("python")) == ["a"]
@@ -0,0 +1,83 @@
+import multiprocessing
+import zlib
+
+import numpy as np
+import pytest
+
+from utils.vector_store import VectorStore, content_key
+
+DIM = 8
+
+
+def _open(directory):
+    return VectorStore(str(directory), DIM, "test-model")
+
+
+def _unit(seed):
+    v = np.random.default_rng(seed).normal(size=DIM).astype(np.float32)
+    return v / np.linalg.norm(v)
+
+
+def _writer(directory, worker, n):
+    store = _open(directory)
+    for i in range(n):
+        # Every worker also writes the shared keys, so duplicates race too
+        key = f"shared-{i}" if i % 3 == 0 else f"w{worker}-{i}"
+        store.add([key], [_unit(zlib.crc32(key.encode()))], "doc", labels=[key])
+
+
+def test_add_and_search(tmp_path):
+    store = _open(tmp_path)
+    assert store.add(["a", "b", "a"], [_unit(1), _unit(2), _unit(3)], "doc", labels=["A", "B", "A2"]) == 2
+    assert store.add(["a"], [_unit(1)], "doc") == 0
+    assert len(store) == 2
+    hits = store.search(_unit(2), top_k=1)
+    assert hits[0]["key"] == "b" and hits[0]["label"] == "B"
+    assert hits[0]["score"] > 0.999
+
+
+def test_reader_sees_rows_added_by_another_handle(tmp_path):
+    reader, writer = _open(tmp_path), _open(tmp_path)
+    reader.add(["a"], [_unit(1)], "doc")
+    assert len(reader.vectors) == 1
+    writer.add(["b"], [_unit(2)], "other")
+    assert len(reader.vectors) == 2
+    assert reader.search(_unit(2), top_k=1, kind="other")[0]["key"] == "b"
+    np.testing.assert_allclose(reader.get("b"), _unit(2), rtol=1e-6)
+
+
+def test_orphan_vectors_are_overwritten(tmp_path):
+    store = _open(tmp_path)
+    store.add(["a"], [_unit(1)], "doc")
+    with open(tmp_path / "vectors.bin", "ab") as f:
+        f.write(_unit(99).tobytes())  # a writer that died before committing its row
+    store.add(["b"], [_unit(2)], "doc")
+    np.testing.assert_allclose(store.get("b"), _unit(2), rtol=1e-6)
+    assert (tmp_path / "vectors.bin").stat().st_size == 2 * DIM * 4
+
+
+def test_concurrent_writers_keep_rows_aligned(tmp_path):
+    ctx = multiprocessing.get_context("spawn")
+    workers = [ctx.Process(target=_writer, args=(tmp_path, w, 30)) for w in range(4)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(60)
+        assert p.exitcode == 0
+
+    store = _open(tmp_path)
+    keys = {f"shared-{i}" for i in range(0, 30, 3)} | {f"w{w}-{i}" for w in range(4) for i in range(30) if i % 3}
+    assert len(store) == len(keys)
+    assert (tmp_path / "vectors.bin").stat().st_size == len(keys) * DIM * 4
+    for key in keys:
+        np.testing.assert_allclose(store.get(key), _unit(zlib.crc32(key.encode())), rtol=1e-6)
+
+
+def test_store_is_tied_to_its_backend(tmp_path):
+    VectorStore(str(tmp_path), DIM, "test-model", backend="torch")
+    with pytest.raises(ValueError):
+        VectorStore(str(tmp_path), DIM, "test-model", backend="onnx-int8")
+
+
+def test_content_key_depends_on_backend():
+    assert content_key("text", "m", "torch") != content_key("text", "m", "onnx-int8")
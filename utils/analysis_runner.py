@@ -0,0 +1,89 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from config import ANALYSIS_WORKERS, ANALYSIS_RESULT_CACHE_SIZE
+from utils.pdf_utils import extract_text_from_pdf
+
+
+def upload_key(resume_bytes, jd_bytes):
+    """Content hash of an upload pair; identical files map to the same analysis."""
+    digest = hashlib.sha256()
+    for part in (resume_bytes, jd_bytes):
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class AnalysisJob:
+    """One graph run in a background thread; the UI polls `snapshot()` while it streams."""
+
+    def __init__(self, key):
+        self.key = key
+        self.result = {}
+        self.completed = []  # node names, in completion order
+        self.error = None
+        self.version = 0  # bumped on every update so pollers only redraw on change
+        self.done = threading.Event()
+        self._lock = threading.Lock()
+
+    def run(self, graph, resume_bytes, jd_bytes):
+        try:
+            inputs = {
+                "resume_text": extract_text_from_pdf(resume_bytes),
+                "jd_text": jd_bytes.decode("utf-8"),
+            }
+            for update in graph.stream(inputs, stream_mode="updates"):
+                with self._lock:
+                    for node, values in update.items():
+                        self.result.update(values or {})
+                        self.completed.append(node)
+                    self.version += 1
+        except Exception as e:
+            with self._lock:
+                self.error = f"{type(e).__name__}: {e}"
+                self.version += 1
+        finally:
+            self.done.set()
+
+    def snapshot(self):
+        with self._lock:
+            return self.version, dict(self.result), list(self.completed), self.error
+
+
+class AnalysisRunner:
+    """Thread pool plus an LRU of jobs keyed by upload hash, shared by all sessions.
+
+    Only finished jobs are evicted: a running one is still being polled by a session,
+    so the cache may exceed `max_results` while more than that many jobs are running.
+    """
+
+    def __init__(self, graph, max_workers=ANALYSIS_WORKERS, max_results=ANALYSIS_RESULT_CACHE_SIZE):
+        self.graph = graph
+        self.max_results = max_results
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analysis")
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, resume_bytes, jd_bytes):
+        """Start (or reuse) the analysis for these uploads and return its job."""
+        key = upload_key(resume_bytes, jd_bytes)
+        with self._lock:
+            job = self._jobs.get(key)
+            # Failed runs are not memoized; submitting again retries them
+            if job is not None and not (job.done.is_set() and job.error):
+                self._jobs.move_to_end(key)
+                return job
+            job = self._jobs[key] = AnalysisJob(key)
+            excess = len(self._jobs) - self.max_results
+            if excess > 0:
+                finished = [k for k, queued in self._jobs.items() if queued.done.is_set()]
+                for k in finished[:excess]:
+                    del self._jobs[k]
+        self._executor.submit(job.run, self.graph, resume_bytes, jd_bytes)
+        return job
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
@@ -0,0 +1,72 @@
+import hashlib
+import json
+import threading
+
+from config import (
+    LLM_MODEL,
+    ARTIFACT_STORE_ENABLED,
+    ARTIFACT_STORE_PATH,
+    ARTIFACT_STORE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+)
+from utils.cache_utils import DiskCache, make_cache_key
+from utils.telemetry import record_cache_lookup
+
+# Bump when a node's output format changes so stale artifacts are never reused
+ARTIFACT_VERSION = 3
+
+_artifact_store = None
+_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """The on-disk artifact store, opened on first use (None when disabled)."""
+    global _artifact_store
+    if _artifact_store is None and ARTIFACT_STORE_ENABLED:
+        with _lock:
+            if _artifact_store is None:
+                _artifact_store = DiskCache(
+                    ARTIFACT_STORE_PATH,
+                    namespace="graph_artifacts",
+                    max_entries=ARTIFACT_STORE_MAX_ENTRIES,
+                    ttl_seconds=LLM_CACHE_TTL_SECONDS,
+                )
+    return _artifact_store
+
+
+def content_hash(value):
+    """Exact hash of a graph input or derived artifact.
+
+    Unlike prompt cache keys, whitespace counts: section splitting and the regex
+    fallbacks depend on line structure.
+    """
+    payload = json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def artifact_key(kind, *inputs):
+    """Key for the artifact `kind` derived from the given input hashes and settings."""
+    return make_cache_key(ARTIFACT_VERSION, LLM_MODEL, kind, *inputs)
+
+
+def load_or_compute(kind, inputs, compute):
+    """Reuse the stored `kind` artifact for these inputs, or compute and store it.
+
+    `inputs` are the hashes of everything the artifact depends on, plus the prompt
+    fingerprints and settings that shape it. `compute` returns (artifact dict,
+    reusable); like failed LLM calls, artifacts built from a fallback (reusable is
+    False) or with all values empty are returned but not stored, so they are
+    recomputed next time.
+    """
+    artifact_store = get_artifact_store()
+    if artifact_store is None:
+        return compute()[0]
+    key = artifact_key(kind, *inputs)
+    cached = artifact_store.get(key)
+    record_cache_lookup("artifacts", cached is not None)
+    if cached is not None:
+        return cached
+    value, reusable = compute()
+    if reusable and any(value.values()):
+        artifact_store.set(key, value)
+    return value
@@ -0,0 +1,183 @@
+import re
+from functools import lru_cache
+
+from config import LLM_MODEL, PROMPT_TOKEN_BUDGET, CHUNK_TOKENS, SKILL_EMBEDDING_MODEL
+
+# Section regexes shared with the regex fallback parsers in utils/data_utils.py
+NEXT_SECTION = r'(?=\n[A-Z][A-Z ]{2,}|$)'
+SKILLS_SECTION_PATTERN = r'(?i)SKILLS\s*[:\-]?\s*(.*?)' + NEXT_SECTION
+PROJECTS_SECTION_PATTERN = r'(?i)PROJECTS\s+(.*?)' + NEXT_SECTION
+RESPONSIBILITIES_SECTION_PATTERN = r'(?i)(Responsibilities|Requirements)[:-]?\s+(.*?)(?=(Qualifications|$))'
+
+# A header is a line on its own: ALL CAPS (5+ chars, so "AWS" or "SQL" lines in a
+# skills list don't count), or a common section name in any case
+SECTION_HEADER_RE = re.compile(
+    r'^\s*(?:[A-Z][A-Z &/]{4,}'
+    r'|(?i:skills|technical skills|projects|key projects|experience|work experience|education'
+    r'|summary|profile|certifications|requirements|responsibilities|qualifications|about us|benefits))'
+    r'\s*[:\-]*\s*$',
+    re.MULTILINE,
+)
+
+# Shorter lines (dates, single skills) legitimately repeat and are never deduplicated
+MIN_DEDUPE_CHARS = 20
+
+BOILERPLATE_RE = re.compile(
+    r'(?i)^(page \d+( of \d+)?|references available upon request|curriculum vitae|resume'
+    r'|.*equal opportunity employer.*|.*all qualified applicants will receive.*)$'
+)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        try:
+            return tiktoken.encoding_for_model(LLM_MODEL)
+        except KeyError:
+            return tiktoken.get_encoding("cl100k_base")
+    except Exception as e:
+        # tiktoken fetches its BPE files on first use; offline hosts fall back to the estimate
+        print("⚠️ tiktoken encoding unavailable, estimating token counts:", e)
+        return None
+
+
+def count_tokens(text):
+    """Tokens as the prompt model counts them (tiktoken), or a ~4 chars/token estimate."""
+    encoding = _encoding()
+    if encoding is None:
+        return max(1, len(text) // 4)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text, budget):
+    encoding = _encoding()
+    if encoding is None:
+        return text[:budget * 4]
+    return encoding.decode(encoding.encode(text, disallowed_special=())[:budget])
+
+
+def _normalize_line(line):
+    return re.sub(r'[\W_]+', ' ', line.lower()).strip()
+
+
+def dedupe_lines(text):
+    """Drop repeated lines (headers/footers on every page) and known boilerplate."""
+    seen = set()
+    kept = []
+    for line in text.splitlines():
+        key = _normalize_line(line)
+        if not key:
+            if kept and kept[-1] != "":
+                kept.append("")
+            continue
+        if key in seen or BOILERPLATE_RE.match(line.strip()):
+            continue
+        if len(key) >= MIN_DEDUPE_CHARS:
+            seen.add(key)
+        kept.append(line.rstrip())
+    return "\n".join(kept).strip()
+
+
+def split_sections(text):
+    """[(title, body)] in document order; text before the first header has title ''."""
+    sections = []
+    title, start = "", 0
+    for match in SECTION_HEADER_RE.finditer(text):
+        body = text[start:match.start()].strip()
+        if body or title:
+            sections.append((title, body))
+        title, start = match.group().strip().rstrip(":- "), match.end()
+    sections.append((title, text[start:].strip()))
+    return [(t, b) for t, b in sections if b]
+
+
+def chunk_sections(sections, max_tokens=CHUNK_TOKENS):
+    """Group each section's lines into chunks of at most ~`max_tokens`.
+
+    Returns dicts with the section title, the chunk text (title prefixed) and its
+    token count, in document order.
+    """
+    chunks = []
+    for title, body in sections:
+        current, current_tokens = [], 0
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            tokens = count_tokens(line)
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append(_make_chunk(title, current))
+                current, current_tokens = [], 0
+            current.append(line)
+            current_tokens += tokens
+        if current:
+            chunks.append(_make_chunk(title, current))
+    return chunks
+
+
+def _make_chunk(title, lines):
+    text = (f"{title}:\n" if title else "") + "\n".join(lines)
+    return {"section": title, "text": text, "tokens": count_tokens(text)}
+
+
+def _relevance(chunks, query):
+    from utils.model_registry import get_sentence_model
+
+    model = get_sentence_model(SKILL_EMBEDDING_MODEL)
+    embs = model.encode([query] + [c["text"] for c in chunks], normalize_embeddings=True, convert_to_numpy=True)
+    return embs[1:] @ embs[0]
+
+
+def fits_budget(text, budget=PROMPT_TOKEN_BUDGET):
+    """True if `compress_for_prompt` would only clean `text`, not select chunks from it."""
+    return not budget or count_tokens(dedupe_lines(text)) <= budget
+
+
+def compress_for_prompt(text, budget=PROMPT_TOKEN_BUDGET, query=None, priority_sections=()):
+    """Bound `text` to roughly `budget` tokens before it is interpolated into a prompt.
+
+    Boilerplate and repeated lines are always removed. If the document is still over
+    budget it is split into section chunks, which are ranked by embedding similarity to
+    `query` (e.g. the JD for a resume) with `priority_sections` ranked first, and kept
+    greedily until the budget is spent. Kept chunks stay in document order, and the
+    result always satisfies `fits_budget(result, budget)`.
+    """
+    cleaned = dedupe_lines(text)
+    if not budget or count_tokens(cleaned) <= budget:
+        return cleaned
+
+    import numpy as np
+
+    chunks = chunk_sections(split_sections(cleaned))
+    if not chunks:
+        return cleaned
+    priority = tuple(p.lower() for p in priority_sections)
+    boost = np.array([1.0 if any(p in c["section"].lower() for p in priority) else 0.0 for c in chunks])
+    relevance = _relevance(chunks, query) if query and query.strip() else np.zeros(len(chunks))
+    # Ties (no query) fall back to document order
+    order = sorted(range(len(chunks)), key=lambda i: (-(boost[i] + relevance[i]), i))
+
+    # Each kept chunk after the first also costs the separator joining it on
+    separator = "\n\n"
+    separator_tokens = count_tokens(separator)
+    selected, used = [], 0
+    for i in order:
+        cost = chunks[i]["tokens"] + (separator_tokens if selected else 0)
+        if used + cost > budget:
+            continue
+        selected.append(i)
+        used += cost
+    # Token counts don't add up exactly across joins; check the assembled text and drop
+    # the least relevant chunks until it fits
+    while selected:
+        compressed = separator.join(chunks[i]["text"] for i in sorted(selected))
+        if fits_budget(compressed, budget):
+            return compressed
+        selected.pop()
+    truncated = truncate_to_tokens(chunks[order[0]]["text"], budget)
+    while not fits_budget(truncated, budget):
+        truncated = truncate_to_tokens(truncated, count_tokens(truncated) - 1)
+    return truncated
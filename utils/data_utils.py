@@ -1,63 +1,86 @@
-import fitz  # PyMuPDF
 import re
 from prompts import (
     extract_resume_info_with_llm,
     extract_jd_info_with_llm,
     llm_match_skills_and_responsibilities
 )
+from utils.chunking import (
+    SKILLS_SECTION_PATTERN,
+    PROJECTS_SECTION_PATTERN,
+    RESPONSIBILITIES_SECTION_PATTERN,
+    compress_for_prompt,
+)
+from utils.skill_taxonomy import get_taxonomy
+
+RESUME_PRIORITY_SECTIONS = ("skills", "projects", "experience")
+JD_PRIORITY_SECTIONS = ("requirements", "responsibilities", "skills", "qualifications")
 
-def extract_text_from_pdf(pdf_path):
-    """Extract raw text from PDF using PyMuPDF."""
-    with fitz.open(pdf_path) as doc:
-        text = ""
-        for page in doc:
-            text += page.get_text()
-    return text
+def _fallback_skills(text):
+    # The skills section split on separators, else every known skill mentioned anywhere
+    match = re.search(SKILLS_SECTION_PATTERN, text, re.DOTALL)
+    if match:
+        skills = [s.strip() for s in re.split(r',|\n|•|·', match.group(1)) if s.strip()]
+        if skills:
+            return skills
+    return get_taxonomy().extract(text)
 
 def clean_text(text):
     """Basic cleaning: remove extra spaces and normalize."""
     return re.sub(r'\s+', ' ', text.strip())
 
-def parse_resume_text(resume_text):
-    # LLM extraction with regex fallback
-    skills, projects = extract_resume_info_with_llm(resume_text)
+def parse_resume_text(resume_text, jd_text=None):
+    # LLM extraction (on a token-bounded, JD-relevant excerpt) with regex fallback.
+    # Returns (resume data, from_llm); from_llm is False if any fallback filled in a field.
+    prompt_text = compress_for_prompt(resume_text, query=jd_text, priority_sections=RESUME_PRIORITY_SECTIONS)
+    skills, projects, experience = extract_resume_info_with_llm(prompt_text)
+    from_llm = bool(skills)
     if not skills:
-        pattern = r'(?i)SKILLS\s*[:\-]?\s*(.*?)(?=\n[A-Z][A-Z ]{2,}|$)'
-        match = re.search(pattern, resume_text, re.DOTALL)
-        if match:
-            skills_line = match.group(1)
-            skills = [s.strip() for s in re.split(r',|\n|•|·', skills_line) if s.strip()]
+        skills = _fallback_skills(resume_text)
+    skills = get_taxonomy().canonicalize_all(skills)
     if not projects:
-        pattern = r'(?i)PROJECTS\s+(.*?)(?=\n[A-Z][A-Z ]{2,}|$)'
-        match = re.search(pattern, resume_text, re.DOTALL)
+        match = re.search(PROJECTS_SECTION_PATTERN, resume_text, re.DOTALL)
         if match:
             projects_block = match.group(1)
             projects = [p.strip() for p in re.split(r'\n|•|·', projects_block) if p.strip()]
+            from_llm = from_llm and not projects
     return {
-        "raw_text": resume_text,
         "SKILLS": ", ".join(skills),
-        "Key projects": projects
-    }
+        "Key projects": projects,
+        "Experience": experience
+    }, from_llm
 
 def parse_jd_text(jd_text):
-    # LLM extraction with regex fallback
-    skills, responsibilities = extract_jd_info_with_llm(jd_text)
+    # LLM extraction with regex fallback; returns (JD data, from_llm) like parse_resume_text
+    prompt_text = compress_for_prompt(jd_text, priority_sections=JD_PRIORITY_SECTIONS)
+    skills, responsibilities = extract_jd_info_with_llm(prompt_text)
+    from_llm = bool(skills)
     if not skills:
-        pattern = r'(?i)SKILLS\s*[:\-]?\s*(.*?)(?=\n[A-Z][A-Z ]{2,}|$)'
-        match = re.search(pattern, jd_text, re.DOTALL)
-        if match:
-            skills_line = match.group(1)
-            skills = [s.strip() for s in re.split(r',|\n|•|·', skills_line) if s.strip()]
+        skills = _fallback_skills(jd_text)
+    skills = get_taxonomy().canonicalize_all(skills)
     if not responsibilities:
-        pattern = r'(?i)(Responsibilities|Requirements)[:-]?\s+(.*?)(?=(Qualifications|$))'
-        match = re.search(pattern, jd_text, re.DOTALL)
+        match = re.search(RESPONSIBILITIES_SECTION_PATTERN, jd_text, re.DOTALL)
         if match:
             resp_block = match.group(2)
             responsibilities = [r.strip() for r in re.split(r'\n|•|·', resp_block) if r.strip()]
+            from_llm = from_llm and not responsibilities
     return {
         "critical_skills": skills,
         "key_responsibilities": responsibilities
-    }
+    }, from_llm
+
+def add_to_text_index(index, doc_ids, resume_texts, parsed=None):
+    """Add resumes to a BM25 `TextIndex`; returns how many were new or changed.
+
+    `parsed` optionally maps doc ids to resume data from `parse_resume_text`, whose SKILLS and
+    Key projects are indexed alongside the raw text. Unchanged resumes are skipped.
+    """
+    parsed = parsed or {}
+    docs = []
+    for doc_id, text in zip(doc_ids, resume_texts):
+        resume_data = parsed.get(doc_id) or {}
+        skills = [s for s in resume_data.get("SKILLS", "").split(",") if s.strip()]
+        docs.append((doc_id, text, skills, resume_data.get("Key projects") or []))
+    return index.add_many(docs)
 
 def get_llm_matching(resume_data, jd_data):
     resume_skills = resume_data.get("SKILLS", "")
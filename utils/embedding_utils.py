@@ -1,16 +1,71 @@
+import re
+
 import numpy as np
-import torch
-from sentence_transformers import SentenceTransformer
+from config import SKILL_EMBEDDING_MODEL, EMBEDDING_WINDOW_OVERLAP
+from utils.model_registry import get_sentence_model, embedding_dimension
+
+def _windows(text, model, overlap=EMBEDDING_WINDOW_OVERLAP):
+    """Split `text` into overlapping windows that each fit the model's max sequence length.
+
+    Returns (window texts, token count per window). Windows are sliced from the
+    original text using tokenizer offsets, so nothing is lost to decoding.
+    """
+    size = (getattr(model, "max_seq_length", None) or 256) - 2  # room for [CLS]/[SEP]
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is not None and getattr(tokenizer, "is_fast", False):
+        spans = tokenizer(text, add_special_tokens=False, return_offsets_mapping=True, verbose=False)["offset_mapping"]
+    else:
+        # No offsets available: fall back to words, sized for ~1.3 tokens per word
+        spans = [m.span() for m in re.finditer(r'\S+', text)]
+        size = max(1, int(size * 0.75))
+    if len(spans) <= size:
+        return [text], [max(1, len(spans))]
+
+    step = max(1, size - overlap)
+    windows, counts = [], []
+    for start in range(0, len(spans), step):
+        chunk = spans[start:start + size]
+        windows.append(text[chunk[0][0]:chunk[-1][1]])
+        counts.append(len(chunk))
+        if start + size >= len(spans):
+            break
+    return windows, counts
+
+def embed_documents(texts, model=None, batch_size=64):
+    """Normalized full-length document embeddings, shape (len(texts), dim).
 
-embedder = SentenceTransformer("all-MiniLM-L6-v2")
+    Every document is split into token windows, the windows of all documents are
+    encoded together in one batched `encode` call, and each document's window
+    embeddings are mean-pooled (weighted by window length) back into one vector.
+    """
+    model = model or get_sentence_model()
+    texts = list(texts)
+    if not texts:
+        return np.zeros((0, embedding_dimension(model)), dtype=np.float32)
 
-def get_mean_embedding(text, embedder=embedder):
+    windows, counts, starts = [], [], []
+    for text in texts:
+        doc_windows, doc_counts = _windows(text, model)
+        starts.append(len(windows))
+        windows.extend(doc_windows)
+        counts.extend(doc_counts)
+
+    embs = model.encode(windows, batch_size=batch_size, normalize_embeddings=True, convert_to_numpy=True)
+    weights = np.asarray(counts, dtype=np.float32)[:, None]
+    pooled = np.add.reduceat(embs * weights, starts, axis=0) / np.add.reduceat(weights, starts, axis=0)
+    return pooled / np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+
+def get_mean_embedding(text, embedder=None):
+    import torch
+
+    embedder = embedder or get_sentence_model(SKILL_EMBEDDING_MODEL)
     if not text.strip():
-        return torch.zeros(1, 384)
-    embeddings = embedder.encode(text, convert_to_tensor=True).reshape(1, -1)
-    return embeddings
+        return torch.zeros(1, embedding_dimension(embedder))
+    return torch.from_numpy(embed_documents([text], embedder)).reshape(1, -1)
 
 def cosine_similarity(a, b):
+    import torch
+
     a_norm = a / a.norm(dim=1, keepdim=True)
     b_norm = b / b.norm(dim=1, keepdim=True)
-    return torch.mm(a_norm, b_norm.transpose(0, 1)).item()
\ No newline at end of file
+    return torch.mm(a_norm, b_norm.transpose(0, 1)).item()
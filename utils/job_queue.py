@@ -0,0 +1,183 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+from utils.cache_utils import make_cache_key
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+class SQLiteJobQueue:
+    """Durable work queue for batch screening, shared by worker processes via one SQLite file.
+
+    A job is claimed under a lease, which its worker renews with `extend_lease` while
+    it runs; if the worker dies the lease expires and another worker picks the job up.
+    Only the worker holding a job's lease can complete or fail it, so a worker that
+    stalled past its lease can't overwrite the outcome of the one that took over. Job
+    ids are derived from the batch and payload, so enqueueing the same work twice is a
+    no-op, and a job only ever records one result.
+
+    SQLite's locking needs every worker on the same host as the file (not a network
+    share). Any backend with the same methods (`create_batch`, `enqueue`, `claim`,
+    `extend_lease`, `complete`, `fail`, `counts`, `results`) can stand in for this
+    one, e.g. a Redis-backed queue for workers spread across machines.
+    """
+
+    def __init__(self, path, lease_seconds=600, max_attempts=3):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS batches (
+                batch TEXT PRIMARY KEY,
+                jd_text TEXT NOT NULL,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                batch TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                status TEXT NOT NULL,
+                attempts INTEGER NOT NULL DEFAULT 0,
+                worker TEXT,
+                lease_expires_at REAL,
+                result TEXT,
+                error TEXT,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_status ON jobs (batch, status)")
+
+    @contextmanager
+    def _transaction(self):
+        # BEGIN IMMEDIATE serializes writers across processes; a failure leaves nothing behind
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def create_batch(self, batch, jd_text):
+        """Register a batch. Re-creating it with the same JD is a no-op; a different JD raises
+        ValueError, since jobs already queued (or done) were screened against the first one."""
+        with self._lock:
+            with self._transaction():
+                self._conn.execute(
+                    "INSERT OR IGNORE INTO batches (batch, jd_text, created_at) VALUES (?, ?, ?)",
+                    (batch, jd_text, time.time()),
+                )
+                (existing,) = self._conn.execute("SELECT jd_text FROM batches WHERE batch = ?", (batch,)).fetchone()
+        if existing != jd_text:
+            raise ValueError(f"Batch {batch!r} already exists with a different JD; use a new batch name.")
+
+    def batch_jd(self, batch):
+        with self._lock:
+            row = self._conn.execute("SELECT jd_text FROM batches WHERE batch = ?", (batch,)).fetchone()
+        return row[0] if row else None
+
+    def enqueue(self, batch, payloads):
+        """Add jobs for `payloads` (JSON-able dicts); returns how many were new."""
+        now = time.time()
+        rows = [
+            (make_cache_key(batch, payload), batch, json.dumps(payload, ensure_ascii=False), PENDING, now)
+            for payload in payloads
+        ]
+        with self._lock:
+            before = self._conn.total_changes
+            with self._transaction():
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO jobs (id, batch, payload, status, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+            return self._conn.total_changes - before
+
+    def claim(self, batch, worker):
+        """Lease the next pending (or abandoned) job: (job_id, payload, attempt) or None."""
+        now = time.time()
+        with self._lock:
+            with self._transaction():
+                # Jobs whose worker crashed on their last attempt are given up on
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, error = COALESCE(error, 'worker lease expired'), "
+                    "updated_at = ? WHERE batch = ? AND status = ? AND lease_expires_at < ? AND attempts >= ?",
+                    (FAILED, now, batch, RUNNING, now, self.max_attempts),
+                )
+                row = self._conn.execute(
+                    "SELECT id, payload, attempts FROM jobs WHERE batch = ? AND "
+                    "(status = ? OR (status = ? AND lease_expires_at < ?)) "
+                    "ORDER BY attempts, updated_at LIMIT 1",
+                    (batch, PENDING, RUNNING, now),
+                ).fetchone()
+                if row is not None:
+                    self._conn.execute(
+                        "UPDATE jobs SET status = ?, attempts = attempts + 1, worker = ?, "
+                        "lease_expires_at = ?, updated_at = ? WHERE id = ?",
+                        (RUNNING, worker, now + self.lease_seconds, now, row[0]),
+                    )
+        if row is None:
+            return None
+        job_id, payload, attempts = row
+        return job_id, json.loads(payload), attempts + 1
+
+    def extend_lease(self, job_id, worker):
+        """Renew `worker`'s lease on a running job; False if the job is no longer its own."""
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_expires_at = ?, updated_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (now + self.lease_seconds, now, job_id, worker, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def complete(self, job_id, worker, result):
+        """Record `worker`'s result; False (and nothing recorded) if it no longer holds the job."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = NULL, lease_expires_at = NULL, updated_at = ? "
+                "WHERE id = ? AND worker = ? AND status = ?",
+                (DONE, json.dumps(result, ensure_ascii=False), time.time(), job_id, worker, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def fail(self, job_id, worker, error):
+        """Return `worker`'s job to the queue, or mark it failed once its attempts are used up.
+
+        False if the job is no longer `worker`'s (its lease lapsed and it was claimed again).
+        """
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "error = ?, lease_expires_at = NULL, updated_at = ? WHERE id = ? AND worker = ? AND status = ?",
+                (self.max_attempts, FAILED, PENDING, error, time.time(), job_id, worker, RUNNING),
+            )
+        return cursor.rowcount == 1
+
+    def counts(self, batch):
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM jobs WHERE batch = ? GROUP BY status", (batch,)
+            ).fetchall()
+        return {status: count for status, count in rows}
+
+    def results(self, batch):
+        """Yield (job_id, payload, result) for every finished job in the batch."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id, payload, result FROM jobs WHERE batch = ? AND status = ? ORDER BY id",
+                (batch, DONE),
+            ).fetchall()
+        for job_id, payload, result in rows:
+            yield job_id, json.loads(payload), json.loads(result)
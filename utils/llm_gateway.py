@@ -0,0 +1,198 @@
+import asyncio
+import random
+import threading
+import time
+import weakref
+
+from config import (
+    OPENAI_API_KEY,
+    LLM_MODEL,
+    LLM_TEMPERATURE,
+    LLM_MAX_CONCURRENCY,
+    LLM_REQUESTS_PER_MINUTE,
+    LLM_MAX_RETRIES,
+    LLM_BACKOFF_BASE_SECONDS,
+    LLM_BACKOFF_MAX_SECONDS,
+    LLM_TIMEOUT_SECONDS,
+    LLM_HTTP_POOL_SIZE,
+    LLM_STRUCTURED_METHOD,
+)
+from utils.telemetry import record_llm_call
+
+
+class LLMError(RuntimeError):
+    """Raised when an LLM call fails for good (non-retryable error or retries exhausted)."""
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self):
+        # Takes a token now and returns how long the caller must wait before using it
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+
+_llm = None
+_llm_lock = threading.Lock()
+_structured_llms = {}  # output schema -> client bound to it
+_rate_limiter = TokenBucket(LLM_REQUESTS_PER_MINUTE / 60.0) if LLM_REQUESTS_PER_MINUTE else None
+_sync_slots = threading.BoundedSemaphore(LLM_MAX_CONCURRENCY)
+_async_slots = weakref.WeakKeyDictionary()  # event loop -> asyncio.Semaphore
+
+
+def get_llm():
+    """The process-wide ChatOpenAI client, built on first use with pooled HTTP clients."""
+    global _llm
+    if _llm is None:
+        with _llm_lock:
+            if _llm is None:
+                if not OPENAI_API_KEY:
+                    raise ValueError("OPENAI_API_KEY is missing. Check your .env file.")
+                # The client stack takes most of a second to import; only pay for it on first call
+                import httpx
+                from langchain_openai import ChatOpenAI
+
+                limits = httpx.Limits(
+                    max_connections=LLM_HTTP_POOL_SIZE,
+                    max_keepalive_connections=LLM_HTTP_POOL_SIZE,
+                )
+                _llm = ChatOpenAI(
+                    openai_api_key=OPENAI_API_KEY,
+                    model=LLM_MODEL,
+                    temperature=LLM_TEMPERATURE,
+                    timeout=LLM_TIMEOUT_SECONDS,
+                    max_retries=0,  # retries are handled here so they share the rate limit
+                    http_client=httpx.Client(limits=limits, timeout=LLM_TIMEOUT_SECONDS),
+                    http_async_client=httpx.AsyncClient(limits=limits, timeout=LLM_TIMEOUT_SECONDS),
+                )
+    return _llm
+
+
+def get_structured_llm(schema):
+    """The shared client bound to a Pydantic `schema` (OpenAI structured outputs by default).
+
+    Invoking it returns {"raw": AIMessage, "parsed": model or None, "parsing_error": ...}
+    so token usage is still recorded and a bad reply can be repaired by the caller.
+    """
+    runnable = _structured_llms.get(schema)
+    if runnable is None:
+        options = {"strict": True} if LLM_STRUCTURED_METHOD != "json_mode" else {}
+        runnable = get_llm().with_structured_output(
+            schema, method=LLM_STRUCTURED_METHOD, include_raw=True, **options
+        )
+        _structured_llms[schema] = runnable
+    return runnable
+
+
+def _async_slot():
+    loop = asyncio.get_running_loop()
+    slot = _async_slots.get(loop)
+    if slot is None:
+        slot = _async_slots[loop] = asyncio.Semaphore(LLM_MAX_CONCURRENCY)
+    return slot
+
+
+def _is_retryable(error):
+    import httpx
+    import openai
+
+    if isinstance(error, (openai.RateLimitError, openai.APIConnectionError)):
+        return True
+    if isinstance(error, openai.APIStatusError):
+        return error.status_code == 429 or error.status_code >= 500
+    return isinstance(error, httpx.TransportError)
+
+
+def _backoff_seconds(error, attempt):
+    response = getattr(error, "response", None)
+    retry_after = response.headers.get("retry-after") if response is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), LLM_BACKOFF_MAX_SECONDS)
+        except ValueError:
+            pass
+    delay = min(LLM_BACKOFF_BASE_SECONDS * (2 ** attempt), LLM_BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.5, 1.0)  # jitter so throttled workers don't retry in lockstep
+
+
+def _record_call(started, response=None, schema=None, error=None):
+    # Telemetry must never turn a completed call into a failed (and retried) one
+    try:
+        if error is not None:
+            record_llm_call(time.perf_counter() - started, error=error)
+        else:
+            record_llm_call(time.perf_counter() - started, response["raw"] if schema is not None else response)
+    except Exception as e:
+        print(f"⚠️ Could not record LLM call: {type(e).__name__}: {e}")
+
+
+def invoke_llm(prompt, schema=None):
+    """Blocking `llm.invoke` with the shared concurrency cap, rate limit and retry policy.
+
+    With a `schema`, the call goes through `get_structured_llm(schema)` and returns its dict.
+    """
+    llm = get_structured_llm(schema) if schema is not None else get_llm()
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        if _rate_limiter:
+            _rate_limiter.acquire()
+        started = time.perf_counter()
+        try:
+            with _sync_slots:
+                response = llm.invoke(prompt)
+        except Exception as e:
+            _record_call(started, error=f"{type(e).__name__}: {e}")
+            if not _is_retryable(e) or attempt == LLM_MAX_RETRIES:
+                raise LLMError(f"LLM call failed after {attempt + 1} attempt(s): {e}") from e
+            time.sleep(_backoff_seconds(e, attempt))
+            continue
+        _record_call(started, response, schema)
+        return response
+
+
+async def ainvoke_llm(prompt, schema=None):
+    """Async counterpart of `invoke_llm` using `llm.ainvoke`."""
+    llm = get_structured_llm(schema) if schema is not None else get_llm()
+    for attempt in range(LLM_MAX_RETRIES + 1):
+        if _rate_limiter:
+            await _rate_limiter.aacquire()
+        started = time.perf_counter()
+        try:
+            async with _async_slot():
+                response = await llm.ainvoke(prompt)
+        except Exception as e:
+            _record_call(started, error=f"{type(e).__name__}: {e}")
+            if not _is_retryable(e) or attempt == LLM_MAX_RETRIES:
+                raise LLMError(f"LLM call failed after {attempt + 1} attempt(s): {e}") from e
+            await asyncio.sleep(_backoff_seconds(e, attempt))
+            continue
+        _record_call(started, response, schema)
+        return response
+
+
+async def abatch_llm(prompts, return_exceptions=False):
+    """Run many prompts concurrently; each call still goes through the limits above."""
+    return await asyncio.gather(
+        *(ainvoke_llm(p) for p in prompts), return_exceptions=return_exceptions
+    )
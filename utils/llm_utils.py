@@ -1,41 +1,197 @@
-import os
 import json
 import re
-from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
+import threading
+from config import (
+    LLM_MODEL,
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_PATH,
+    LLM_CACHE_MAX_ENTRIES,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_REPAIR_ATTEMPTS,
+)
+from utils.cache_utils import DiskCache, make_cache_key
+from utils.llm_gateway import invoke_llm, ainvoke_llm
+from utils.semantic_cache import get_semantic_cache
+from utils.telemetry import record_cache_lookup, record_llm_output
 
-load_dotenv()
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+# The API key is checked when the client is first built (utils/llm_gateway.get_llm),
+# so importing this module has no side effects
+_llm_cache = None
+_llm_cache_lock = threading.Lock()
 
-if not OPENAI_API_KEY:
-    raise ValueError("OPENAI_API_KEY is missing. Check your .env file.")
+def get_llm_cache():
+    """The on-disk LLM result cache, opened on first use (None when disabled)."""
+    global _llm_cache
+    if _llm_cache is None and LLM_CACHE_ENABLED:
+        with _llm_cache_lock:
+            if _llm_cache is None:
+                _llm_cache = DiskCache(
+                    LLM_CACHE_PATH,
+                    namespace="llm_json",
+                    max_entries=LLM_CACHE_MAX_ENTRIES,
+                    ttl_seconds=LLM_CACHE_TTL_SECONDS,
+                )
+    return _llm_cache
 
-llm = ChatOpenAI(openai_api_key=OPENAI_API_KEY, model="gpt-4o", temperature=0.3)
+def _prompt_cache_key(prompt_or_str, variables, schema=None):
+    # Keyed on model + template + inputs (+ output schema), so editing a prompt invalidates its entries
+    template = getattr(prompt_or_str, "template", prompt_or_str)
+    if schema is None:
+        return make_cache_key(LLM_MODEL, template, variables or {})
+    return make_cache_key(LLM_MODEL, template, variables or {}, schema.model_json_schema())
 
-def call_llm_json(prompt_or_str, variables=None):
+def prompt_fingerprint(template, schema=None):
+    """Hash of everything about a prompt except its inputs: model, template and output schema."""
+    return make_cache_key(LLM_MODEL, template, schema.model_json_schema() if schema is not None else None)
+
+def _extract_json(content):
+    # The whole reply, else the first JSON object embedded in it (code fences, preambles)
+    content = content.strip()
     try:
-        # Running the LLM call
-        response = llm.invoke(prompt_or_str.format(**(variables or {})))
-        content = response.content.strip()
-
-        # Extracting clean JSON block from any junk response
-        match = re.search(r'\{[\s\S]+\}', content)
-        if match:
-            json_block = match.group()
+        value = json.loads(content)
+    except json.JSONDecodeError:
+        decoder = json.JSONDecoder()
+        for match in re.finditer(r'\{', content):
             try:
-                return json.loads(json_block)
-            except json.JSONDecodeError as e:
-                print("⚠️ JSON Decode Error:", e)
-                print("⚠️ Raw JSON:\n", json_block)
-                return {}
+                value, _ = decoder.raw_decode(content, match.start())
+                break
+            except json.JSONDecodeError:
+                continue
         else:
-            print("⚠️ No JSON block found in LLM output.")
-            print("Raw content:", content)
-            return {}
+            raise ValueError("no JSON object found in the reply")
+    if not isinstance(value, dict):
+        raise ValueError(f"expected a JSON object, got {type(value).__name__}")
+    return value
+
+def _parse_reply(response, schema):
+    """(result or None, reply text, error) for one LLM response."""
+    if schema is not None:
+        raw = response["raw"]
+        if response.get("parsed") is not None:
+            return response["parsed"].model_dump(), raw.content, None
+        error = raw.additional_kwargs.get("refusal") or response.get("parsing_error") or "empty reply"
+    else:
+        raw, error = response, None
+    content = raw.content if isinstance(raw.content, str) else json.dumps(raw.content)
+    # Salvage locally before spending another call on a repair
+    try:
+        value = _extract_json(content)
+        return (schema.model_validate(value).model_dump() if schema is not None else value), content, None
+    except ValueError as e:  # pydantic's ValidationError is a ValueError
+        return None, content, str(error or e)[:2000]
 
-    except Exception as e:
-        print("⚠️ Fatal Exception while calling LLM:", e)
+def _repair_prompt(prompt, reply, error):
+    return (
+        f"{prompt}\n\nYour previous reply could not be used:\n{error}\n\n"
+        f"Previous reply:\n{reply[:4000]}\n\nReply again with only the corrected JSON object."
+    )
+
+def _finish(result, error, calls):
+    if result is None:
+        print(f"⚠️ Unusable LLM output after {calls} call(s): {error}")
+        record_llm_output("failed")
         return {}
+    record_llm_output("ok" if calls == 1 else "repaired")
+    return result
+
+def _cache_lookup(prompt_or_str, variables, schema=None):
+    llm_cache = get_llm_cache()
+    if llm_cache is None:
+        return None, None
+    cache_key = _prompt_cache_key(prompt_or_str, variables, schema)
+    cached = llm_cache.get(cache_key)
+    record_cache_lookup("llm_json", cached is not None)
+    return cache_key, cached
+
+def _is_empty(result):
+    # {} after a failure, or a reply whose every field is empty
+    return not result or not any(result.values())
+
+def _cache_store(cache_key, result):
+    # Empty results are never cached so a bad response can't stick
+    if cache_key and not _is_empty(result):
+        get_llm_cache().set(cache_key, result)
+
+def _semantic_lookup(prompt_or_str, variables, schema, cache_key):
+    """(result, pending entry): a near-duplicate's result, or what to index after a fresh call."""
+    semantic_cache = get_semantic_cache(get_llm_cache())
+    if semantic_cache is None:
+        return None, None
+    # One namespace per template + schema: only answers to the same question are reused
+    template = getattr(prompt_or_str, "template", prompt_or_str)
+    namespace = prompt_fingerprint(template, schema)
+    inputs = "\n".join(f"{k}: {variables[k]}" for k in sorted(variables)) if variables else str(template)
+    result, _, embedding = semantic_cache.lookup(namespace, inputs)
+    if result is not None:
+        _cache_store(cache_key, result)  # an exact repeat of these inputs skips the embedding next time
+        return result, None
+    return None, (namespace, embedding)
+
+def _semantic_store(pending, cache_key, result):
+    if pending is not None and not _is_empty(result):
+        # The result is already in hand and exactly cached; losing its index entry only costs a future hit
+        try:
+            get_semantic_cache(get_llm_cache()).add(pending[0], cache_key, pending[1])
+        except Exception as e:
+            print(f"⚠️ Semantic cache write failed: {type(e).__name__}: {e}")
+
+def call_llm_json(prompt_or_str, variables=None, schema=None):
+    """Run a prompt and return its JSON object. Transport failures raise `LLMError`.
+
+    With a Pydantic `schema` the reply is constrained to it and validated. A reply
+    that doesn't parse or validate gets up to LLM_REPAIR_ATTEMPTS follow-up calls
+    showing the model its error; if none succeeds the result is {}.
+
+    Results are cached by exact inputs and, with SEMANTIC_CACHE_ENABLED, reused for
+    near-duplicate inputs too (see utils/semantic_cache.py).
+    """
+    cache_key, cached = _cache_lookup(prompt_or_str, variables, schema)
+    if cached is not None:
+        return cached
+    cached, pending = _semantic_lookup(prompt_or_str, variables, schema, cache_key)
+    if cached is not None:
+        return cached
+
+    prompt = prompt_or_str.format(**(variables or {}))
+    request = prompt
+    for calls in range(1, LLM_REPAIR_ATTEMPTS + 2):
+        result, reply, error = _parse_reply(invoke_llm(request, schema=schema), schema)
+        if result is not None:
+            break
+        request = _repair_prompt(prompt, reply, error)
+    result = _finish(result, error, calls)
+    _cache_store(cache_key, result)
+    _semantic_store(pending, cache_key, result)
+    return result
+
+async def acall_llm_json(prompt_or_str, variables=None, schema=None):
+    cache_key, cached = _cache_lookup(prompt_or_str, variables, schema)
+    if cached is not None:
+        return cached
+    cached, pending = _semantic_lookup(prompt_or_str, variables, schema, cache_key)
+    if cached is not None:
+        return cached
+
+    prompt = prompt_or_str.format(**(variables or {}))
+    request = prompt
+    for calls in range(1, LLM_REPAIR_ATTEMPTS + 2):
+        result, reply, error = _parse_reply(await ainvoke_llm(request, schema=schema), schema)
+        if result is not None:
+            break
+        request = _repair_prompt(prompt, reply, error)
+    result = _finish(result, error, calls)
+    _cache_store(cache_key, result)
+    _semantic_store(pending, cache_key, result)
+    return result
+
+def call_llm_json_verbose(prompt_or_str, variables=None, schema=None):
+    return call_llm_json(prompt_or_str, variables, schema)
+
+def get_llm_cache_stats():
+    llm_cache = get_llm_cache()
+    return llm_cache.stats() if llm_cache is not None else {}
 
-def call_llm_json_verbose(prompt_or_str, variables=None):
-    return call_llm_json(prompt_or_str, variables)
+def get_semantic_cache_stats():
+    """Hit rate and hit similarity of the semantic cache in this process ({} when off)."""
+    semantic_cache = get_semantic_cache(get_llm_cache())
+    return semantic_cache.stats() if semantic_cache is not None else {}
@@ -0,0 +1,76 @@
+import os
+import re
+import threading
+from config import (
+    EMBEDDING_MODEL,
+    EMBEDDING_DEVICE,
+    EMBEDDING_BACKEND,
+    EMBEDDING_ONNX_FILE,
+    EMBEDDING_QUANTIZATION,
+    ONNX_EXPORT_DIR,
+)
+
+BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
+
+_models = {}
+_lock = threading.Lock()
+
+def get_sentence_model(name=None, device=None, backend=None):
+    """Return a process-wide SentenceTransformer, loading it on first use.
+
+    Models are keyed by (name, device, backend) so every module asking for the same
+    model shares one copy of the weights. Defaults come from `config`.
+    """
+    name = name or EMBEDDING_MODEL
+    device = device or EMBEDDING_DEVICE
+    backend = backend or EMBEDDING_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown EMBEDDING_BACKEND {backend!r}; expected one of {', '.join(BACKENDS)}")
+    key = (name, device, backend)
+    model = _models.get(key)
+    if model is None:
+        with _lock:
+            model = _models.get(key)
+            if model is None:
+                model = _load(name, device, backend)
+                _models[key] = model
+    return model
+
+def _load(name, device, backend):
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(name, device=device)
+    if backend == "torch-int8":
+        import torch
+
+        # Dynamic quantization is CPU-only: int8 weights, activations quantized per batch
+        model = SentenceTransformer(name, device="cpu")
+        return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    # An explicit ONNX file (e.g. a pre-quantized one shipped with the model) wins for both ONNX backends
+    if backend == "onnx" or EMBEDDING_ONNX_FILE:
+        model_kwargs = {"file_name": EMBEDDING_ONNX_FILE} if EMBEDDING_ONNX_FILE else None
+        return SentenceTransformer(name, device=device, backend="onnx", model_kwargs=model_kwargs)
+    return _load_onnx_int8(name, device)
+
+def _load_onnx_int8(name, device):
+    # Quantize once into ONNX_EXPORT_DIR and load the int8 graph from there afterwards
+    from sentence_transformers import SentenceTransformer, export_dynamic_quantized_onnx_model
+
+    export_dir = os.path.join(ONNX_EXPORT_DIR, re.sub(r'[^\w.-]+', '_', name))
+    file_name = f"onnx/model_qint8_{EMBEDDING_QUANTIZATION}.onnx"
+    if not os.path.exists(os.path.join(export_dir, file_name)):
+        model = SentenceTransformer(name, device=device, backend="onnx")
+        model.save(export_dir)
+        export_dynamic_quantized_onnx_model(model, EMBEDDING_QUANTIZATION, export_dir)
+    return SentenceTransformer(export_dir, device=device, backend="onnx", model_kwargs={"file_name": file_name})
+
+def embedding_dimension(model):
+    """Output size of `model`, taken from the model itself rather than assumed."""
+    dim = model.get_sentence_embedding_dimension()
+    if dim is None:
+        dim = len(model.encode("dimension probe"))
+    return dim
+
+def loaded_models():
+    return list(_models)
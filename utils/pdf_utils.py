@@ -0,0 +1,65 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many files the process-pool start-up costs more than it saves
+PARALLEL_MIN_FILES = 8
+
+def _open_pdf(source):
+    import fitz  # PyMuPDF; imported on first use to keep start-up fast
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(source), filetype="pdf")
+    if hasattr(source, "read"):
+        return fitz.open(stream=source.read(), filetype="pdf")
+    return fitz.open(source)
+
+def iter_pdf_pages(source):
+    """Yield the text of each page in order.
+
+    `source` may be a file path, the raw PDF bytes, or a binary file object; bytes are
+    opened in memory, so uploads never need to touch disk.
+    """
+    with _open_pdf(source) as doc:
+        for page in doc:
+            yield page.get_text()
+
+def extract_text_from_pdf(source):
+    """Extract raw text from a PDF using PyMuPDF."""
+    return "\n".join(iter_pdf_pages(source))
+
+def _extract_worker(source):
+    try:
+        return extract_text_from_pdf(source), None
+    except Exception as e:
+        return None, str(e)
+
+def _describe(source, index):
+    # Never the raw bytes themselves: an in-memory PDF would be dumped into the log
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return f"PDF #{index} ({len(source)} bytes)"
+    if hasattr(source, "read"):
+        return getattr(source, "name", None) or f"PDF #{index}"
+    return os.fspath(source)
+
+def extract_texts_from_pdfs(sources, max_workers=None):
+    """Yield `(source, text)` for many PDFs, in input order, fanned out to a process pool.
+
+    Text extraction is CPU-bound, so large batches are spread across `max_workers`
+    processes (default: all cores). Unreadable files yield `text=None`.
+    """
+    sources = list(sources)
+    workers = max_workers or os.cpu_count() or 1
+    if workers == 1 or len(sources) < PARALLEL_MIN_FILES:
+        results = map(_extract_worker, sources)
+        for index, (source, (text, error)) in enumerate(zip(sources, results)):
+            if error:
+                print(f"⚠️ Could not read {_describe(source, index)}: {error}")
+            yield source, text
+        return
+
+    chunksize = max(1, len(sources) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(_extract_worker, sources, chunksize=chunksize)
+        for index, (source, (text, error)) in enumerate(zip(sources, results)):
+            if error:
+                print(f"⚠️ Could not read {_describe(source, index)}: {error}")
+            yield source, text
@@ -0,0 +1,103 @@
+import threading
+
+from config import (
+    EMBEDDING_MODEL,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_DIR,
+    SEMANTIC_CACHE_THRESHOLD,
+)
+from utils.telemetry import record_semantic_lookup
+
+# Below this many entries a brute-force scan beats maintaining the IVF index
+_INDEX_MIN_ROWS = 2048
+
+
+class SemanticCache:
+    """Reuse LLM results for prompts whose inputs are near-duplicates of earlier ones.
+
+    Prompt inputs are embedded with `embed_documents` into a `VectorStore`, one kind
+    per prompt template + output schema, labelled with the exact-match cache key of
+    the result; the result itself stays in the LLM DiskCache (`results`). A lookup
+    returns the nearest earlier result if its cosine similarity is at least
+    `threshold`. The best similarity of every lookup is recorded, hit or miss, so the
+    threshold can be tuned from the metrics.
+    """
+
+    def __init__(self, store, results, threshold=SEMANTIC_CACHE_THRESHOLD):
+        self.store = store
+        self.results = results
+        self.threshold = threshold
+        self.lookups = 0
+        self.hits = 0
+        self.hit_similarity = 0.0
+        self._lock = threading.Lock()
+
+    def _embed(self, text):
+        from utils.embedding_utils import embed_documents
+        from utils.model_registry import get_sentence_model
+
+        return embed_documents([text], get_sentence_model(self.store.model_name, backend=self.store.backend))[0]
+
+    def lookup(self, namespace, text):
+        """(cached result or None, similarity of the nearest entry, embedding of `text`)."""
+        embedding = self._embed(text)
+        with self._lock:
+            hits = self.store.search(embedding, top_k=1, kind=namespace)
+        similarity = hits[0]["score"] if hits else 0.0
+        result = None
+        if similarity >= self.threshold:
+            # The result may have been evicted from the DiskCache since; that's a miss
+            result = self.results.get(hits[0]["label"])
+        with self._lock:
+            self.lookups += 1
+            if result is not None:
+                self.hits += 1
+                self.hit_similarity += similarity
+        record_semantic_lookup(similarity, result is not None)
+        return result, similarity, embedding
+
+    def add(self, namespace, result_key, embedding):
+        """Make the result stored under `result_key` findable by inputs close to `embedding`."""
+        with self._lock:
+            self.store.add([result_key], [embedding], namespace, labels=[result_key])
+            if len(self.store) >= _INDEX_MIN_ROWS and self.store.index_is_stale():
+                self.store.build_index()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "entries": len(self.store),
+                "lookups": self.lookups,
+                "hits": self.hits,
+                "hit_rate": round(self.hits / self.lookups, 4) if self.lookups else 0.0,
+                "mean_hit_similarity": round(self.hit_similarity / self.hits, 4) if self.hits else None,
+                "threshold": self.threshold,
+            }
+
+
+_semantic_cache = None
+_disabled = not SEMANTIC_CACHE_ENABLED
+_lock = threading.Lock()
+
+
+def get_semantic_cache(results):
+    """The semantic cache over `results` (the LLM DiskCache), opened on first use.
+
+    None when disabled, when there is no result cache, or when the embedding model
+    can't be loaded (reported once; calls then go straight to the LLM).
+    """
+    global _semantic_cache, _disabled
+    if _disabled or results is None:
+        return None
+    if _semantic_cache is None:
+        with _lock:
+            if _semantic_cache is None and not _disabled:
+                try:
+                    from utils.vector_store import open_store
+                    store = open_store(SEMANTIC_CACHE_DIR, EMBEDDING_MODEL)
+                except Exception as e:
+                    print(f"⚠️ Semantic cache disabled: {type(e).__name__}: {e}")
+                    _disabled = True
+                    return None
+                _semantic_cache = SemanticCache(store, results)
+    return _semantic_cache
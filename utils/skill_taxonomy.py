@@ -0,0 +1,188 @@
+import json
+import re
+import threading
+
+from config import SKILL_TAXONOMY_PATH
+from utils.cache_utils import make_cache_key
+
+_WHITESPACE = str.maketrans({"\n": " ", "\t": " ", "\r": " ", "\u00a0": " "})
+
+
+def _fold(text):
+    # Lowercase without changing the length, so match offsets index the original text
+    lowered = text.translate(_WHITESPACE).lower()
+    if len(lowered) != len(text):
+        lowered = "".join(c if len(c.lower()) != 1 else c.lower() for c in text.translate(_WHITESPACE))
+    return lowered
+
+
+def _normalize(term):
+    return re.sub(r'\s+', ' ', term).strip().lower()
+
+
+# A trailing "(ES6)", "3.11", "v18" or "2.x" qualifies a skill without changing it
+_QUALIFIER = re.compile(r'\s*(?:\([^()]*\)|v?\d+(?:\.\d+)*(?:\.x|\+)?)$')
+
+
+def _is_word_char(text, i, step):
+    # Letters, digits and "&" ("R&D") continue a word; so does a hyphen between letters
+    # ("Go-to-market"). `step` is the direction away from the candidate term.
+    ch = text[i]
+    if ch.isalnum() or ch == "&":
+        return True
+    j = i + step
+    return ch == "-" and 0 <= j < len(text) and text[j].isalpha()
+
+
+class SkillTaxonomy:
+    """Canonical skills and their aliases, compiled into an Aho–Corasick automaton.
+
+    `find` scans a document once, in time linear in its length, and reports every
+    whole-term occurrence of any alias. Terms listed as case-sensitive (e.g. "Go",
+    "Excel") only match when written exactly that way. The C automaton from
+    `pyahocorasick` is used when installed, otherwise an equivalent pure-Python one.
+    """
+
+    def __init__(self, aliases, case_sensitive=()):
+        # Changes whenever the terms do; part of the keys of artifacts derived from them
+        self.fingerprint = make_cache_key(aliases, sorted(case_sensitive))
+        exact = {_normalize(t): t for t in case_sensitive}
+        self.canonicals = list(aliases)
+        self._lookup = {}  # normalized alias -> canonical
+        self._terms = []  # term id -> (length, canonical, exact surface form or None)
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        for canonical in self.canonicals:
+            for term in [canonical, *aliases[canonical]]:
+                key = _normalize(term)
+                if not key or key in self._lookup:
+                    continue
+                self._lookup[key] = canonical
+                self._terms.append((len(key), canonical, exact.get(key)))
+
+        try:
+            import ahocorasick
+        except ImportError:
+            self._automaton = None
+            for term_id, key in enumerate(self._lookup):
+                self._insert(key, term_id)
+            self._link()
+        else:
+            self._automaton = ahocorasick.Automaton()
+            for term_id, key in enumerate(self._lookup):
+                self._automaton.add_word(key, term_id)
+            self._automaton.make_automaton()
+
+    @classmethod
+    def load(cls, path=SKILL_TAXONOMY_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        case_sensitive = data.pop("_case_sensitive", [])
+        return cls(data, case_sensitive)
+
+    def _insert(self, key, term_id):
+        state = 0
+        for ch in key:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(term_id)
+
+    def _link(self):
+        # Breadth-first failure links; each state also reports its suffix states' terms
+        queue = list(self._goto[0].values())  # depth-1 states fail to the root
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[nxt] = self._goto[fallback].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+                queue.append(nxt)
+
+    def _scan(self, lowered):
+        # (index of the last char, term id) for every occurrence of every term
+        if self._automaton is not None:
+            if self._lookup:
+                yield from self._automaton.iter(lowered)
+            return
+        goto, fail, out = self._goto, self._fail, self._out
+        state = 0
+        for pos, ch in enumerate(lowered):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for term_id in out[state]:
+                yield pos, term_id
+
+    def find(self, text):
+        """Non-overlapping (start, end, canonical) matches, leftmost-longest first."""
+        lowered = _fold(text)
+        terms = self._terms
+        size = len(lowered)
+        hits = []
+        for pos, term_id in self._scan(lowered):
+            length, canonical, exact = terms[term_id]
+            start, end = pos + 1 - length, pos + 1
+            # Whole terms only: "java" must not match inside "javascript", nor "r" in "R&D"
+            if start > 0 and lowered[start].isalnum() and _is_word_char(lowered, start - 1, -1):
+                continue
+            if end < size and lowered[end - 1].isalnum() and _is_word_char(lowered, end, 1):
+                continue
+            if exact is not None and text[start:end] != exact:
+                continue
+            hits.append((start, end, canonical))
+
+        hits.sort(key=lambda h: (h[0], h[0] - h[1]))
+        matches, last_end = [], 0
+        for start, end, canonical in hits:
+            if start >= last_end:
+                matches.append((start, end, canonical))
+                last_end = end
+        return matches
+
+    def extract(self, text):
+        """Canonical skills mentioned in `text`, in order of first mention."""
+        return list(dict.fromkeys(canonical for _, _, canonical in self.find(text)))
+
+    def canonicalize(self, skill):
+        """Canonical name for one skill phrase ("JS", "javascript (ES6)", "Python 3.11").
+
+        Only an alias covering the whole phrase (give or take a trailing version or
+        parenthetical) counts, so "Docker Compose" or "AWS Lambda" are not collapsed
+        into "Docker" or "AWS". Other phrases are returned cleaned up but unchanged.
+        """
+        key = _normalize(skill)
+        while key:
+            canonical = self._lookup.get(key)
+            if canonical is not None:
+                return canonical
+            stripped = _QUALIFIER.sub("", key)
+            if stripped == key:
+                break
+            key = stripped
+        return re.sub(r'\s+', ' ', skill).strip()
+
+    def canonicalize_all(self, skills):
+        """Canonicalize and de-duplicate a skill list, keeping first-seen order."""
+        return list(dict.fromkeys(c for c in (self.canonicalize(s) for s in skills) if c))
+
+
+_taxonomy = None
+_lock = threading.Lock()
+
+
+def get_taxonomy():
+    """The configured taxonomy, compiled once per process on first use."""
+    global _taxonomy
+    if _taxonomy is None:
+        with _lock:
+            if _taxonomy is None:
+                _taxonomy = SkillTaxonomy.load(SKILL_TAXONOMY_PATH)
+    return _taxonomy
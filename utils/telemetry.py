@@ -0,0 +1,297 @@
+import bisect
+import contextvars
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from config import (
+    LLM_MODEL,
+    LLM_PRICE_INPUT_PER_MTOK,
+    LLM_PRICE_OUTPUT_PER_MTOK,
+    TRACE_LOG_PATH,
+)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+TOKEN_BUCKETS = (100, 250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+SIMILARITY_BUCKETS = (0.5, 0.7, 0.8, 0.85, 0.9, 0.93, 0.95, 0.97, 0.98, 0.99, 0.995, 1.0)
+
+
+# --- Metrics ---
+class Histogram:
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help = help_text
+        self.buckets = tuple(buckets)
+        self._series = {}  # labels -> [bucket counts..., sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.setdefault(key, [0] * len(self.buckets) + [0.0, 0])
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):  # larger values only show up in +Inf
+                series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series):
+                    cumulative += count
+                    lines.append(f"{self.name}_bucket{_labels(key, le=bound)} {cumulative}")
+                lines.append(f"{self.name}_bucket{_labels(key, le='+Inf')} {series[-1]}")
+                lines.append(f"{self.name}_sum{_labels(key)} {series[-2]}")
+                lines.append(f"{self.name}_count{_labels(key)} {series[-1]}")
+        return lines
+
+
+class Counter:
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help = help_text
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._series.items()):
+                lines.append(f"{self.name}{_labels(key)} {value}")
+        return lines
+
+
+def _labels(key, **extra):
+    pairs = list(key) + list(extra.items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in pairs) + "}"
+
+
+NODE_LATENCY = Histogram("resume_match_node_latency_seconds", "Graph node wall time", LATENCY_BUCKETS)
+NODE_ERRORS = Counter("resume_match_node_errors_total", "Graph node exceptions")
+LLM_LATENCY = Histogram("resume_match_llm_latency_seconds", "LLM call wall time", LATENCY_BUCKETS)
+LLM_PROMPT_TOKENS = Histogram("resume_match_llm_prompt_tokens", "Prompt tokens per LLM call", TOKEN_BUCKETS)
+LLM_CALLS = Counter("resume_match_llm_calls_total", "LLM calls by outcome")
+LLM_TOKENS = Counter("resume_match_llm_tokens_total", "LLM tokens by kind")
+LLM_COST = Counter("resume_match_llm_cost_usd_total", "Estimated LLM spend in USD")
+LLM_OUTPUTS = Counter("resume_match_llm_outputs_total", "LLM results by parse outcome (ok, repaired, failed)")
+CACHE_LOOKUPS = Counter("resume_match_cache_lookups_total", "Cache lookups by cache and result")
+SEMANTIC_SIMILARITY = Histogram(
+    "resume_match_semantic_cache_similarity", "Best cached-prompt similarity per semantic cache lookup",
+    SIMILARITY_BUCKETS,
+)
+METRICS = [
+    NODE_LATENCY, NODE_ERRORS, LLM_LATENCY, LLM_PROMPT_TOKENS, LLM_CALLS, LLM_TOKENS, LLM_COST, LLM_OUTPUTS,
+    CACHE_LOOKUPS, SEMANTIC_SIMILARITY,
+]
+
+
+def render_prometheus():
+    """All metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+def export_metrics(path):
+    """Write the current metrics to `path` (e.g. for the node_exporter textfile collector)."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(render_prometheus())
+    os.replace(tmp_path, path)
+
+
+def start_metrics_server(port, host="0.0.0.0"):
+    """Serve `GET /metrics` from a daemon thread and return the server."""
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+# --- Traces ---
+class Trace:
+    """Everything recorded for one request: node spans and LLM calls."""
+
+    def __init__(self, request_id=None):
+        self.request_id = request_id or uuid.uuid4().hex
+        self.started_at = time.time()
+        self.duration_s = None
+        self.spans = []
+        self.llm_calls = []
+        self.cache = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def add(self, kind, record):
+        with self._lock:
+            getattr(self, kind).append(record)
+
+    def to_dict(self):
+        prompt = sum(c["prompt_tokens"] for c in self.llm_calls)
+        completion = sum(c["completion_tokens"] for c in self.llm_calls)
+        return {
+            "request_id": self.request_id,
+            "started_at": self.started_at,
+            "duration_s": self.duration_s,
+            "spans": list(self.spans),
+            "llm_calls": list(self.llm_calls),
+            "cache": dict(self.cache),
+            "totals": {
+                "llm_calls": len(self.llm_calls),
+                "prompt_tokens": prompt,
+                "completion_tokens": completion,
+                "cost_usd": round(sum(c["cost_usd"] for c in self.llm_calls), 6),
+                "errors": sum(1 for s in self.spans if s["error"]) + sum(1 for c in self.llm_calls if c["error"]),
+            },
+        }
+
+
+_current_trace = contextvars.ContextVar("resume_match_trace", default=None)
+_current_node = contextvars.ContextVar("resume_match_node", default=None)
+recent_traces = deque(maxlen=200)
+_trace_log_lock = threading.Lock()
+
+
+@contextmanager
+def start_trace(request_id=None):
+    """Collect spans/LLM calls made inside the block into a Trace (yielded)."""
+    trace = Trace(request_id)
+    token = _current_trace.set(trace)
+    started = time.perf_counter()
+    try:
+        yield trace
+    finally:
+        trace.duration_s = round(time.perf_counter() - started, 4)
+        _current_trace.reset(token)
+        recent_traces.append(trace)
+        if TRACE_LOG_PATH:
+            with _trace_log_lock, open(TRACE_LOG_PATH, "a", encoding="utf-8") as f:
+                f.write(json.dumps(trace.to_dict(), ensure_ascii=False) + "\n")
+
+
+def current_trace():
+    return _current_trace.get()
+
+
+def instrument_node(name, fn):
+    """Wrap a graph node (sync or async) to record its wall time and errors."""
+    def record(started, error):
+        elapsed = time.perf_counter() - started
+        NODE_LATENCY.observe(elapsed, node=name)
+        if error:
+            NODE_ERRORS.inc(node=name)
+        trace = _current_trace.get()
+        if trace is not None:
+            trace.add("spans", {"node": name, "duration_s": round(elapsed, 4), "error": error})
+
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(state):
+            token = _current_node.set(name)
+            started, error = time.perf_counter(), None
+            try:
+                return await fn(state)
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+                raise
+            finally:
+                record(started, error)
+                _current_node.reset(token)
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(state):
+        token = _current_node.set(name)
+        started, error = time.perf_counter(), None
+        try:
+            return fn(state)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            record(started, error)
+            _current_node.reset(token)
+    return wrapper
+
+
+def token_usage(message):
+    """(prompt_tokens, completion_tokens) reported on a LangChain AIMessage."""
+    usage = getattr(message, "usage_metadata", None) or {}
+    if usage:
+        return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+    usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+    return usage.get("prompt_tokens", 0), usage.get("completion_tokens", 0)
+
+
+def record_llm_call(duration_s, message=None, error=None, model=LLM_MODEL):
+    prompt_tokens, completion_tokens = token_usage(message) if message is not None else (0, 0)
+    cost = (prompt_tokens * LLM_PRICE_INPUT_PER_MTOK + completion_tokens * LLM_PRICE_OUTPUT_PER_MTOK) / 1e6
+    node = _current_node.get() or "unknown"
+
+    LLM_LATENCY.observe(duration_s, node=node, model=model)
+    LLM_CALLS.inc(node=node, status="error" if error else "ok")
+    if prompt_tokens or completion_tokens:
+        LLM_PROMPT_TOKENS.observe(prompt_tokens, node=node)
+        LLM_TOKENS.inc(prompt_tokens, node=node, kind="prompt")
+        LLM_TOKENS.inc(completion_tokens, node=node, kind="completion")
+        LLM_COST.inc(cost, node=node)
+
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.add("llm_calls", {
+            "node": node,
+            "model": model,
+            "duration_s": round(duration_s, 4),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "cost_usd": round(cost, 6),
+            "error": error,
+        })
+
+
+def record_llm_output(outcome):
+    LLM_OUTPUTS.inc(node=_current_node.get() or "unknown", outcome=outcome)
+
+
+def record_cache_lookup(cache, hit):
+    CACHE_LOOKUPS.inc(cache=cache, result="hit" if hit else "miss")
+    trace = _current_trace.get()
+    if trace is not None:
+        with trace._lock:
+            trace.cache["hits" if hit else "misses"] += 1
+
+
+def record_semantic_lookup(similarity, hit):
+    SEMANTIC_SIMILARITY.observe(similarity, node=_current_node.get() or "unknown", result="hit" if hit else "miss")
+    record_cache_lookup("llm_semantic", hit)
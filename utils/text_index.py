@@ -0,0 +1,251 @@
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+from itertools import groupby
+
+import numpy as np
+
+from config import TEXT_INDEX_PATH
+from utils.cache_utils import make_cache_key
+from utils.skill_taxonomy import get_taxonomy
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9+#]*(?:[.\-][a-z0-9+#]+)*")
+_STOPWORDS = frozenset("""
+    a about above after all also an and any are as at be been being but by can could did do does
+    for from had has have having he her his i if in into is it its me more most my no not of on
+    or our out over own she should so some such than that the their them then there these they
+    this those through to too under up us very was we were what when where which while who will
+    with would you your
+""".split())
+
+
+def tokenize(text):
+    """Lowercased word tokens ("c++", "node.js" and "ci-cd" stay whole), minus stopwords."""
+    return [t for t in _TOKEN.findall(text.lower()) if len(t) > 1 and t not in _STOPWORDS]
+
+
+def _pack(values):
+    return np.asarray(values, dtype=np.int32).tobytes()
+
+
+def _merge(parts, live):
+    # One term's postings across segments, keeping only rows of live docs
+    parts = list(parts)
+    docs = np.concatenate([np.frombuffer(p[1], dtype=np.int32) for p in parts])
+    tfs = np.concatenate([np.frombuffer(p[2], dtype=np.int32) for p in parts])
+    keep = docs < len(live)  # rows added by another process after `live` was read
+    keep[keep] = live[docs[keep]]
+    return docs[keep], tfs[keep]
+
+
+def document_terms(text, skills=(), projects=()):
+    """Index terms for a document: its words plus one "skill:<canonical>" term per skill mention.
+
+    Skill terms come from the taxonomy, so "JS" in a resume and "JavaScript" in a JD
+    share a term even though they share no word.
+    """
+    taxonomy = get_taxonomy()
+    terms = tokenize(text)
+    for project in projects:
+        terms += tokenize(project)
+    terms += ["skill:" + canonical.lower() for _, _, canonical in taxonomy.find(text)]
+    terms += ["skill:" + canonical.lower() for canonical in taxonomy.canonicalize_all(skills)]
+    return terms
+
+
+class TextIndex:
+    """Incremental BM25 inverted index on SQLite, used to shortlist resumes cheaply.
+
+    Each `add_many` call writes one segment: per term, the packed arrays of the batch's
+    doc rows and term frequencies. A query reads only its own terms' postings, as a
+    few blobs, so it costs roughly the number of documents sharing a term with it.
+    Re-adding a document with unchanged content is a no-op; changed content gives it a
+    new row, and the old row's postings are ignored until `optimize` drops them.
+    """
+
+    def __init__(self, path, k1=1.2, b=0.75, max_segments=64):
+        self.path = path
+        self.k1 = k1
+        self.b = b
+        self.max_segments = max_segments
+        self._lock = threading.Lock()
+        self._docs = None  # (doc ids by row, lengths by row, live rows, count, average length, version)
+        self._local_changes = 0
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # AUTOINCREMENT: rows of replaced docs are never reused, so their old postings stay dead
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS docs (
+                row INTEGER PRIMARY KEY AUTOINCREMENT,
+                doc_id TEXT UNIQUE NOT NULL,
+                content_hash TEXT NOT NULL,
+                length INTEGER NOT NULL
+            )
+        """)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS postings (
+                term TEXT NOT NULL,
+                segment INTEGER NOT NULL,
+                docs BLOB NOT NULL,
+                tfs BLOB NOT NULL,
+                PRIMARY KEY (term, segment)
+            ) WITHOUT ROWID
+        """)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS segments (segment INTEGER PRIMARY KEY)")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    @contextmanager
+    def _transaction(self):
+        # All or nothing: a doc row without its postings could never be found or re-added
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+        self._conn.execute("COMMIT")
+
+    def add(self, doc_id, text, skills=(), projects=()):
+        """Index one document; returns True if it was new or its content changed.
+
+        Every call that changes something writes a segment, so prefer `add_many` for
+        bulk ingestion.
+        """
+        return self.add_many([(doc_id, text, skills, projects)]) == 1
+
+    def add_many(self, docs):
+        """Index (doc_id, text[, skills[, projects]]) tuples; returns how many were new or changed."""
+        postings = defaultdict(lambda: ([], []))
+        rows = []
+        with self._lock:
+            with self._transaction():
+                for doc_id, text, *fields in docs:
+                    skills, projects = (list(fields) + [(), ()])[:2]
+                    content_hash = make_cache_key(text, list(skills), list(projects))
+                    existing = self._conn.execute(
+                        "SELECT row, content_hash FROM docs WHERE doc_id = ?", (doc_id,)
+                    ).fetchone()
+                    if existing is not None:
+                        if existing[1] == content_hash:
+                            continue
+                        self._conn.execute("DELETE FROM docs WHERE row = ?", (existing[0],))
+                    counts = Counter(document_terms(text, skills, projects))
+                    row = self._conn.execute(
+                        "INSERT INTO docs (doc_id, content_hash, length) VALUES (?, ?, ?)",
+                        (doc_id, content_hash, sum(counts.values())),
+                    ).lastrowid
+                    rows.append(row)
+                    for term, tf in counts.items():
+                        postings[term][0].append(row)
+                        postings[term][1].append(tf)
+                if rows:
+                    # Rows only ever grow, so the batch's first row is a unique segment id
+                    self._conn.executemany(
+                        "INSERT INTO postings (term, segment, docs, tfs) VALUES (?, ?, ?, ?)",
+                        [(term, rows[0], _pack(doc_rows), _pack(tfs)) for term, (doc_rows, tfs) in postings.items()],
+                    )
+                    self._conn.execute("INSERT INTO segments (segment) VALUES (?)", (rows[0],))
+                n_segments = self._conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+            self._local_changes += len(rows)
+        if n_segments > self.max_segments:
+            self.optimize()
+        return len(rows)
+
+    def remove(self, doc_id):
+        with self._lock:
+            self._conn.execute("DELETE FROM docs WHERE doc_id = ?", (doc_id,))
+            self._local_changes += 1
+
+    def optimize(self):
+        """Merge every term's segments into one and drop postings of replaced or removed docs."""
+        with self._lock:
+            with self._transaction():
+                live = self._live_rows()
+                merged = []
+                cursor = self._conn.execute("SELECT term, docs, tfs FROM postings ORDER BY term, segment")
+                for term, parts in groupby(cursor, key=lambda r: r[0]):
+                    docs, tfs = _merge(parts, live)
+                    if len(docs):
+                        merged.append((term, 0, docs.tobytes(), tfs.tobytes()))
+                self._conn.execute("DELETE FROM postings")
+                self._conn.execute("DELETE FROM segments")
+                self._conn.executemany("INSERT INTO postings (term, segment, docs, tfs) VALUES (?, ?, ?, ?)", merged)
+                self._conn.execute("INSERT INTO segments (segment) VALUES (0)")
+            self._local_changes += 1
+
+    def _live_rows(self):
+        rows = [r[0] for r in self._conn.execute("SELECT row FROM docs")]
+        live = np.zeros(max(rows, default=0) + 1, dtype=bool)
+        live[rows] = True
+        return live
+
+    def _doc_table(self):
+        # Doc ids and lengths by row, re-read only when this or another connection wrote
+        version = (self._conn.execute("PRAGMA data_version").fetchone()[0], self._local_changes)
+        if self._docs is None or self._docs[5] != version:
+            rows = self._conn.execute("SELECT row, doc_id, length FROM docs").fetchall()
+            size = max((r[0] for r in rows), default=0) + 1
+            doc_ids = [None] * size
+            lengths = np.zeros(size, dtype=np.float32)
+            live = np.zeros(size, dtype=bool)
+            for row, doc_id, length in rows:
+                doc_ids[row] = doc_id
+                lengths[row] = length
+                live[row] = True
+            avg_length = max(float(lengths.sum()) / len(rows), 1.0) if rows else 1.0
+            self._docs = (doc_ids, lengths, live, len(rows), avg_length, version)
+        return self._docs[:5]
+
+    def search(self, query, limit=100, within=None, max_terms=64):
+        """Top `limit` (doc_id, bm25 score) for a query text, best first (`limit=0`: all).
+
+        `within` restricts results to a collection of doc ids. Documents sharing no
+        term with the query are never returned. Long queries (a whole JD) are scored
+        on their `max_terms` rarest terms; common words add little but cost the most.
+        """
+        terms = list(set(document_terms(query)))
+        with self._lock:
+            doc_ids, lengths, live, n_docs, avg_length = self._doc_table()
+            if not n_docs or not terms:
+                return []
+            rows = []
+            for start in range(0, len(terms), 500):
+                chunk = terms[start:start + 500]
+                rows += self._conn.execute(
+                    f"SELECT term, docs, tfs FROM postings WHERE term IN ({','.join('?' * len(chunk))}) "
+                    "ORDER BY term, segment",
+                    chunk,
+                ).fetchall()
+
+        postings = [_merge(parts, live) for _, parts in groupby(rows, key=lambda r: r[0])]
+        postings = sorted((p for p in postings if len(p[0])), key=lambda p: len(p[0]))[:max_terms]
+        # Length normalization per document, shared by every term
+        norm = self.k1 * (1 - self.b + self.b * lengths / avg_length)
+        scores = np.zeros(len(doc_ids), dtype=np.float32)
+        for docs, tfs in postings:
+            tfs = tfs.astype(np.float32)
+            idf = math.log(1 + (n_docs - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * tfs * (self.k1 + 1) / (tfs + norm[docs])
+
+        if within is not None:
+            within = set(within)
+            scores *= np.fromiter((d in within for d in doc_ids), dtype=bool, count=len(doc_ids))
+        candidates = np.flatnonzero(scores > 0)
+        if limit and len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(doc_ids[i], float(scores[i])) for i in candidates]
+
+
+def open_text_index(path=None):
+    return TextIndex(path or TEXT_INDEX_PATH)
@@ -0,0 +1,361 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from config import (
+    EMBEDDING_BACKEND,
+    EMBEDDING_MODEL,
+    PHRASE_STORE_DIR,
+    SKILL_EMBEDDING_MODEL,
+    VECTOR_STORE_DIR,
+    VECTOR_STORE_DTYPE,
+)
+from utils.cache_utils import make_cache_key
+
+
+# Part of every key, so vectors from an older embedding scheme are never reused
+EMBEDDING_SCHEME = "window-mean-v1"
+
+
+def content_key(text, model_name, backend):
+    """Content hash for a text embedded with a given model on a given backend.
+
+    Quantized backends give slightly different vectors, so they never share entries.
+    """
+    return make_cache_key(model_name, backend, EMBEDDING_SCHEME, text)
+
+
+class VectorStore:
+    """Append-only embedding store backed by a memory-mapped array.
+
+    Layout of `directory`:
+      - store.json      dim / dtype / model / backend the vectors were produced with
+      - vectors.bin     row-major float32 or float16 matrix, one row per item
+      - meta.sqlite3    content key -> row, plus kind ("resume", "jd", "skill", "phrase") and label
+      - ivf.npz         optional inverted-file index built by `build_index`
+
+    Vectors are L2-normalized on insert so a dot product is the cosine score.
+    Searches use the IVF index (coarse k-means centroids, `nprobe` lists scanned)
+    for rows it covers and brute force for rows added since it was built.
+
+    Several processes may share a store: writers are serialized by a SQLite write
+    transaction, and readers pick up rows added elsewhere on their next access.
+    """
+
+    def __init__(self, directory, dim, model_name, dtype="float32", backend=None):
+        self.directory = directory
+        self.dim = int(dim)
+        self.model_name = model_name
+        self.backend = backend or EMBEDDING_BACKEND
+        self.dtype = np.dtype(dtype)
+        self._lock = threading.Lock()
+        self._vectors = None
+        self._kinds = None
+        self._index = None
+
+        os.makedirs(directory, exist_ok=True)
+        self._check_header()
+        self._vectors_path = os.path.join(directory, "vectors.bin")
+        self._index_path = os.path.join(directory, "ivf.npz")
+        self._conn = sqlite3.connect(
+            os.path.join(directory, "meta.sqlite3"), check_same_thread=False, timeout=30
+        )
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS items (
+                row INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL,
+                kind TEXT NOT NULL,
+                label TEXT,
+                created_at REAL NOT NULL
+            )
+        """)
+        self._truncate_orphan_rows()
+
+    # --- Setup ---
+    def _check_header(self):
+        header_path = os.path.join(self.directory, "store.json")
+        header = {"dim": self.dim, "dtype": self.dtype.name, "model": self.model_name, "backend": self.backend}
+        if not os.path.exists(header_path):
+            # Written aside and renamed into place, so a process opening the store
+            # concurrently never reads a half-written header
+            temp_path = f"{header_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(temp_path, "w", encoding="utf-8") as f:
+                json.dump(header, f)
+            os.replace(temp_path, header_path)
+        with open(header_path, "r", encoding="utf-8") as f:
+            existing = json.load(f)
+        if existing != header:
+            raise ValueError(
+                f"Vector store at {self.directory} was built with {existing}, not {header}."
+            )
+
+    def _truncate_orphan_rows(self):
+        # Vectors are appended before their metadata is committed, so a crash can
+        # leave trailing rows nobody references; drop them. Under the write lock, as
+        # another process may be between those two steps right now.
+        with self._lock, self._write_transaction():
+            self._truncate_vectors(len(self))
+
+    def _truncate_vectors(self, n_rows):
+        expected = n_rows * self.dim * self.dtype.itemsize
+        if os.path.exists(self._vectors_path) and os.path.getsize(self._vectors_path) > expected:
+            with open(self._vectors_path, "r+b") as f:
+                f.truncate(expected)
+
+    @contextmanager
+    def _write_transaction(self):
+        # BEGIN IMMEDIATE takes SQLite's write lock up front, so only one process at
+        # a time allocates rows and appends to vectors.bin
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield
+        except BaseException:
+            self._conn.rollback()
+            raise
+        self._conn.commit()
+
+    # --- Storage ---
+    def __len__(self):
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM items").fetchone()
+        return count
+
+    def count(self, kind=None):
+        if kind is None:
+            return len(self)
+        (count,) = self._conn.execute("SELECT COUNT(*) FROM items WHERE kind = ?", (kind,)).fetchone()
+        return count
+
+    @property
+    def vectors(self):
+        """Read-only memmap over all stored rows (re-mapped when any process added rows)."""
+        n = len(self)
+        if n == 0:
+            return np.zeros((0, self.dim), dtype=self.dtype)
+        if self._vectors is None or len(self._vectors) != n:
+            self._vectors = np.memmap(self._vectors_path, dtype=self.dtype, mode="r", shape=(n, self.dim))
+        return self._vectors
+
+    def _kind_array(self, n):
+        if self._kinds is None or len(self._kinds) < n:
+            rows = self._conn.execute("SELECT kind FROM items ORDER BY row").fetchall()
+            self._kinds = np.array([r[0] for r in rows], dtype=object)
+        return self._kinds
+
+    def has(self, key):
+        return self._conn.execute("SELECT 1 FROM items WHERE key = ?", (key,)).fetchone() is not None
+
+    def rows_for(self, keys):
+        """Map content keys to row numbers (None for keys not stored)."""
+        found = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            for key, row in self._conn.execute(
+                f"SELECT key, row FROM items WHERE key IN ({placeholders})", chunk
+            ):
+                found[key] = row
+        return [found.get(k) for k in keys]
+
+    def get(self, key):
+        (row,) = self.rows_for([key])
+        return None if row is None else np.asarray(self.vectors[row], dtype=np.float32)
+
+    def add(self, keys, embeddings, kind, labels=None):
+        """Append embeddings for keys not already stored. Returns the number added."""
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+        labels = list(labels) if labels is not None else [None] * len(embeddings)
+        with self._lock, self._write_transaction():
+            # Checked under the write lock: another process may have stored some keys meanwhile
+            existing = set(k for k, row in zip(keys, self.rows_for(keys)) if row is not None)
+            new, seen = [], set()
+            for i, key in enumerate(keys):
+                if key not in existing and key not in seen:
+                    new.append(i)
+                    seen.add(key)
+            if not new:
+                return 0
+
+            batch = embeddings[new]
+            norms = np.linalg.norm(batch, axis=1, keepdims=True)
+            batch = batch / np.where(norms == 0, 1, norms)
+            start = len(self)
+            # Drop anything a crashed writer left past the last committed row, so row
+            # `start` lands at its own offset
+            self._truncate_vectors(start)
+            with open(self._vectors_path, "ab") as f:
+                f.write(batch.astype(self.dtype).tobytes())
+            now = time.time()
+            self._conn.executemany(
+                "INSERT INTO items (row, key, kind, label, created_at) VALUES (?, ?, ?, ?, ?)",
+                [(start + j, keys[i], kind, labels[i], now) for j, i in enumerate(new)],
+            )
+            self._kinds = None
+            return len(new)
+
+    # --- Index ---
+    def build_index(self, n_lists=None, n_iter=10, sample_size=50000, seed=0):
+        """Train spherical k-means centroids and bucket every row into its nearest list."""
+        vectors = self.vectors
+        n = len(vectors)
+        if n == 0:
+            return
+        n_lists = n_lists or max(1, min(4096, int(4 * np.sqrt(n))))
+        n_lists = min(n_lists, n)
+        rng = np.random.default_rng(seed)
+
+        sample = vectors[np.sort(rng.choice(n, size=min(n, sample_size), replace=False))]
+        sample = np.asarray(sample, dtype=np.float32)
+        centroids = sample[rng.choice(len(sample), size=n_lists, replace=False)].copy()
+        for _ in range(n_iter):
+            assign = _nearest(sample, centroids)
+            counts = np.bincount(assign, minlength=n_lists)
+            sums = np.zeros_like(centroids)
+            by_list = np.argsort(assign, kind="stable")
+            filled = counts > 0
+            starts = np.concatenate([[0], np.cumsum(counts)[:-1]])[filled]
+            sums[filled] = np.add.reduceat(sample[by_list], starts, axis=0)
+            empty = ~filled
+            if empty.any():
+                sums[empty] = sample[rng.choice(len(sample), size=int(empty.sum()))]
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            centroids = sums / np.where(norms == 0, 1, norms)
+
+        assign = _nearest(vectors, centroids)
+        order = np.argsort(assign, kind="stable").astype(np.int64)
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=n_lists))]).astype(np.int64)
+        np.savez(self._index_path, centroids=centroids, order=order, offsets=offsets, n_indexed=n)
+        self._index = None
+
+    def _load_index(self):
+        if self._index is None and os.path.exists(self._index_path):
+            with np.load(self._index_path) as data:
+                self._index = {k: data[k] for k in data.files}
+        return self._index
+
+    def index_is_stale(self, max_unindexed_fraction=0.1):
+        index = self._load_index()
+        n = len(self)
+        if index is None:
+            return n > 0
+        return n - int(index["n_indexed"]) > max_unindexed_fraction * n
+
+    def search(self, query, top_k=10, kind=None, nprobe=8):
+        """Return the `top_k` nearest rows to `query` as dicts with key/label/kind/score."""
+        vectors = self.vectors
+        n = len(vectors)
+        if n == 0:
+            return []
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        query = query / (np.linalg.norm(query) or 1.0)
+
+        index = self._load_index()
+        if index is None:
+            candidates = np.arange(n)
+        else:
+            centroid_scores = index["centroids"] @ query
+            probe = np.argsort(-centroid_scores)[:nprobe]
+            offsets, order = index["offsets"], index["order"]
+            candidates = np.concatenate(
+                [order[offsets[c]:offsets[c + 1]] for c in probe]
+                + [np.arange(int(index["n_indexed"]), n)]
+            )
+            candidates.sort()
+
+        if kind is not None:
+            candidates = candidates[self._kind_array(n)[candidates] == kind]
+        if len(candidates) == 0:
+            return []
+
+        scores = np.asarray(vectors[candidates], dtype=np.float32) @ query
+        k = min(top_k, len(scores))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        rows = candidates[top]
+
+        meta = {}
+        placeholders = ",".join("?" * len(rows))
+        for row, key, row_kind, label in self._conn.execute(
+            f"SELECT row, key, kind, label FROM items WHERE row IN ({placeholders})",
+            [int(r) for r in rows],
+        ):
+            meta[row] = (key, row_kind, label)
+        return [
+            {"key": meta[int(r)][0], "kind": meta[int(r)][1], "label": meta[int(r)][2], "score": float(s)}
+            for r, s in zip(rows, scores[top])
+        ]
+
+
+def _nearest(vectors, centroids, chunk_size=8192):
+    assign = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk_size):
+        block = np.asarray(vectors[start:start + chunk_size], dtype=np.float32)
+        assign[start:start + chunk_size] = np.argmax(block @ centroids.T, axis=1)
+    return assign
+
+
+def embed_with_store(store, texts, model, kind, labels=None, batch_size=64):
+    """Embed `texts` with `model`, encoding only those whose content key is not stored yet.
+
+    Returns the (normalized) embedding matrix in input order.
+    """
+    texts = list(texts)
+    keys = [content_key(t, store.model_name, store.backend) for t in texts]
+    rows = store.rows_for(keys)
+    missing = list({keys[i]: i for i, row in enumerate(rows) if row is None}.values())  # each new text once
+    if missing:
+        from utils.embedding_utils import embed_documents
+
+        fresh = embed_documents([texts[i] for i in missing], model, batch_size=batch_size)
+        store.add(
+            [keys[i] for i in missing],
+            fresh,
+            kind,
+            labels=[labels[i] for i in missing] if labels is not None else None,
+        )
+        rows = store.rows_for(keys)
+    return np.asarray(store.vectors[rows], dtype=np.float32)
+
+
+def open_store(directory=None, model_name=None, dtype=None, backend=None):
+    """Open (or create) the store for embeddings from `model_name` on `backend` (default: config)."""
+    from utils.model_registry import get_sentence_model, embedding_dimension
+
+    model_name = model_name or EMBEDDING_MODEL
+    backend = backend or EMBEDDING_BACKEND
+    model = get_sentence_model(model_name, backend=backend)
+    return VectorStore(
+        directory or VECTOR_STORE_DIR,
+        embedding_dimension(model),
+        model_name,
+        dtype=dtype or VECTOR_STORE_DTYPE,
+        backend=backend,
+    )
+
+
+_phrase_store = None
+_phrase_store_disabled = not PHRASE_STORE_DIR
+_phrase_store_lock = threading.Lock()
+
+
+def get_phrase_store():
+    """The store of skill and responsibility phrase embeddings (SKILL_EMBEDDING_MODEL), opened on first use.
+
+    None when disabled or when it can't be opened (reported once; phrases are then
+    encoded on every call).
+    """
+    global _phrase_store, _phrase_store_disabled
+    if _phrase_store is None and not _phrase_store_disabled:
+        with _phrase_store_lock:
+            if _phrase_store is None and not _phrase_store_disabled:
+                try:
+                    _phrase_store = open_store(PHRASE_STORE_DIR, SKILL_EMBEDDING_MODEL)
+                except Exception as e:
+                    print(f"⚠️ Phrase embedding store disabled: {type(e).__name__}: {e}")
+                    _phrase_store_disabled = True
+    return _phrase_store